@@ -1,15 +1,19 @@
 import os
 import sys
+import copy
 import pygame
 import random
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Union
 from .utils.logger import Logger
 from .display.fps import FPS
+from .display.animation_manager import AnimationManager
 from .utils.commandline import Commandline
 from .utils.configuration import AppSettings, SkinSettings
-from .modules.cache.remote_image import RemoteImageCache
-from .modules.cache.rss import RSSCache
+from .modules.cache.prefetch import RemoteCachePrefetcher, RemoteCacheKind
+from .modules.cache.manager import CacheManager
+from .modules.cache.decoded_image import DecodedImageCache, ImageScalingMode
+from .modules.http.http_client import HTTPClient
 
 from .display.widgets.fps_widget import FPSWidget
 from .display.widgets.simple_label_widget import SimpleLabelWidget
@@ -24,9 +28,14 @@ from .display.widgets.charts.chart_widget import ChartWidgetHorizontalTextBlock
 from .display.widgets.charts.line_chart_widget import LineChartWidget
 from .display.widgets.widget_font import WidgetFont, WidgetFontTextAlign
 
-from .modules.mqtt.mqtt_client import MQTTClient
-from .modules.data_source.queue_data_source import QueueDataSource
-from .modules.data_source.mqtt.telegraf.mqtt_telegraf_data_source import MQTTTelegrafCPUDataSource, MQTTTelegrafCPUTemperatureDataSource
+from .modules.mqtt.mqtt_client import MQTTClient, DEFAULT_CONNECTION_NAME as DEFAULT_MQTT_CONNECTION_NAME, DEFAULT_BATCH_INTERVAL as DEFAULT_MQTT_BATCH_INTERVAL
+from .modules.data_source.queue_data_source import QueueDataSource, DataSourceNumberType
+from .modules.timeseries.time_series import TimeSeriesStore
+from .modules.timeseries.snapshot import TimeSeriesSnapshot
+from .modules.queue.queue import Queue, QueuePolicy, QueueDownsampleMode, DEFAULT_MAX_SIZE as DEFAULT_QUEUE_MAX_SIZE, DEFAULT_BLOCK_TIMEOUT as DEFAULT_QUEUE_BLOCK_TIMEOUT
+from .modules.queue.ring_buffer import SampleRingBuffer, DEFAULT_CAPACITY as DEFAULT_RING_BUFFER_CAPACITY
+from .modules.data_source.mqtt.telegraf.mqtt_telegraf_data_source import MQTTTelegrafDataSource, MQTTTelegrafCPUDataSource, MQTTTelegrafCPUTemperatureDataSource
+from .modules.data_source.mqtt.telegraf.mqtt_telegraf_subscription import MQTTTelegrafSubscription
 from .modules.data_source.random.random_data_source import RandomDataSource
 
 class Boot:
@@ -43,19 +52,27 @@ class Boot:
         self.__current_screen_resolution = (self.__screen_info.current_w, self.__screen_info.current_h)
         self.__app_settings = None
         self.__skin_settings = None
+        self.__remote_caches = None
         self.__load_settings_and_skin()
+        HTTPClient(timeout = self.__app_settings.http_timeout, retries = self.__app_settings.http_retries, backoff_factor = self.__app_settings.http_backoff_factor, max_concurrency = self.__app_settings.http_max_concurrency, pool_maxsize = self.__app_settings.http_pool_maxsize)
+        self.__history_snapshot = None
+        if self.__app_settings.cache_path is not None:
+            CacheManager(base_path = self.__app_settings.cache_path, quotas = self.__app_settings.cache_quotas, gc_interval = self.__app_settings.cache_gc_interval)
+            if self.__app_settings.history_snapshot_interval > 0:
+                self.__history_snapshot = TimeSeriesSnapshot(base_path = self.__app_settings.cache_path, interval = self.__app_settings.history_snapshot_interval)
+                TimeSeriesStore.set_snapshot(self.__history_snapshot)
         if (self.__skin_settings.width, self.__skin_settings.height) != self.__current_screen_resolution:
             raise ValueError(f"Error: skin size (width: {self.__skin_settings.width}px, height: {self.__skin_settings.height}px) do not match with current screen resolution (width: {self.__screen_info.current_w}px, height: {self.__screen_info.current_h}px).")
         self.__main_surface = pygame.display.set_mode(size = self.__current_screen_resolution, flags = pygame.HWSURFACE | pygame.DOUBLEBUF | pygame.NOFRAME, display = self.__app_settings.monitor_index)
         pygame.display.set_caption(self.__app_settings.app_name)
+        self.__prefetch_remote_caches()
         self.__refresh_background()
 
         self.__mqtt_data = None
 
-        self.__mqtt = None
-
-        if self.__app_settings.mqtt_broker_host and self.__app_settings.mqtt_broker_port > 0:
-            self.__mqtt = MQTTClient(broker = self.__app_settings.mqtt_broker_host, port = self.__app_settings.mqtt_broker_port, username = self.__app_settings.mqtt_username, password = self.__app_settings.mqtt_password)
+        self.__mqtt_connections: Dict[str, MQTTClient] = {}
+        self.__mqtt_connections_settings: Dict[str, Dict[str, Any]] = {}
+        self.__refresh_mqtt_connections()
 
         self.__widgets = []
         self.__load_widgets()
@@ -72,14 +89,42 @@ class Boot:
     def end(self):
         if self.__app_settings.hide_mouse_cursor:
             pygame.mouse.set_visible(True)
+        if self.__history_snapshot is not None:
+            self.__history_snapshot.save()
+        for mqtt in self.__mqtt_connections.values():
+            mqtt.stop()
         pygame.quit()
 
     def __load_settings_and_skin(self) -> None:
         self.__app_settings = AppSettings(path = self.__command_line.configuration if self.__command_line.configuration is not None else "config.yaml")
         self.__skin_settings = SkinSettings(path = self.__command_line.skin if self.__command_line.skin is not None else self.__app_settings.skin)
 
+    def __prefetch_remote_caches(self) -> None:
+        rss_urls = []
+        image_urls = []
+        if self.__skin_settings.background_image is None and self.__skin_settings.background_image_url is not None:
+            image_urls.append(self.__skin_settings.background_image_url)
+        for widget_settings in self.__skin_settings.widgets.values():
+            if widget_settings.get("visible", False):
+                if widget_settings.get("type", None) == "horizontal_ticker" and widget_settings.get('rss_url', None) is not None:
+                    rss_urls.append(widget_settings.get('rss_url'))
+                elif widget_settings.get("type", None) == "image" and widget_settings.get('url', None) is not None:
+                    image_urls.append(widget_settings.get('url'))
+        if self.__remote_caches is not None:
+            self.__remote_caches.stop()
+        # failed prefetches are retried in background (widgets are rebuilt when they recover)
+        self.__remote_caches = RemoteCachePrefetcher(base_path = self.__app_settings.cache_path, max_concurrency = self.__app_settings.http_max_concurrency)
+        self.__remote_caches.fetch(rss_urls = rss_urls, image_urls = image_urls)
+
     def __set_background_image(self, path: str) -> None:
         if os.path.exists(path):
+            if self.__app_settings.cache_path is not None:
+                try:
+                    # decoded (pre-scaled) pixels cache: no decoding / scaling on every background refresh
+                    self.__main_surface.blit(DecodedImageCache(base_path = self.__app_settings.cache_path, source_path = path, target_size = self.__current_screen_resolution, scaling_mode = ImageScalingMode.STRETCH).load_surface(), (0, 0))
+                    return
+                except Exception as e:
+                    self.__log.warning(f"Error loading decoded background image cache of {path}: {e}")
             wallpaper_image = pygame.image.load(path)
             wallpaper_scaled = pygame.transform.scale(wallpaper_image, self.__current_screen_resolution)
             self.__main_surface.blit(wallpaper_scaled, (0, 0))
@@ -90,11 +135,15 @@ class Boot:
         if self.__skin_settings.background_image is not None:
             self.__set_background_image(self.__skin_settings.background_image)
         elif self.__skin_settings.background_image_url is not None:
-            try:
-                cache = RemoteImageCache(base_path=self.__app_settings.cache_path, url=self.__skin_settings.background_image_url)
-                self.__set_background_image(cache.full_path)
-            except Exception as e:
-                self.__log.error(f"Error setting remote background image: {e}")
+            cache = self.__remote_caches.get(RemoteCacheKind.IMAGE, self.__skin_settings.background_image_url)
+            if cache is not None:
+                try:
+                    self.__set_background_image(cache.full_path)
+                except Exception as e:
+                    self.__log.error(f"Error setting remote background image: {e}")
+            else:
+                # remote image not available (placeholder: background color)
+                self.__main_surface.fill(self.__skin_settings.background_color or pygame.Color("black"))
         else:
             self.__main_surface.fill(self.__skin_settings.background_color or pygame.Color("black"))
         pygame.display.flip()
@@ -141,12 +190,79 @@ class Boot:
             style_italic = widget_settings.get('font_style_italic', False)
         )
 
-    def get_widget_data_source_from_config(self, widget_settings: Dict[str, Any], mqtt: MQTTClient) -> QueueDataSource:
+    def get_data_source_queue_from_config(self, queue_settings: Optional[Dict[str, Any]]) -> Union[Queue, SampleRingBuffer]:
+        queue_settings = queue_settings or {}
+        if queue_settings.get('type', None) == "ring":
+            # lock-free (single producer / single consumer) float samples ring
+            return SampleRingBuffer(capacity = queue_settings.get('size', DEFAULT_RING_BUFFER_CAPACITY))
+        return Queue(
+            max_size = queue_settings.get('size', DEFAULT_QUEUE_MAX_SIZE),
+            policy = QueuePolicy.from_string(queue_settings.get('policy', QueuePolicy.LAST_N.value)),
+            downsample_mode = QueueDownsampleMode.from_string(queue_settings.get('downsample', QueueDownsampleMode.AVG.value)),
+            block_timeout = queue_settings.get('block_timeout', DEFAULT_QUEUE_BLOCK_TIMEOUT)
+        )
+
+    def get_mqtt_connection_from_settings(self, name: str, connection_settings: Optional[Dict[str, Any]]) -> Optional[MQTTClient]:
+        connection_settings = connection_settings or {}
+        if not connection_settings.get('broker_host', None) or connection_settings.get('broker_port', 1883) <= 0:
+            self.__log.warning(f"MQTT connection {name} disabled (no broker host / port).")
+            return None
+        try:
+            return MQTTClient(
+                broker = connection_settings.get('broker_host'),
+                port = connection_settings.get('broker_port', 1883),
+                username = connection_settings.get('username', None),
+                password = connection_settings.get('password', None),
+                batch_interval = connection_settings.get('batch_interval', DEFAULT_MQTT_BATCH_INTERVAL),
+                name = name
+            )
+        except Exception as e:
+            # an unreachable broker only disables its own connection (widgets bound to it are skipped)
+            self.__log.error(f"MQTT connection {name} disabled (connection error: {e}).")
+            return None
+
+    def __refresh_mqtt_connections(self) -> None:
+        """(Re)connect the configured MQTT connections whose settings changed (or which are not connected) since the last call."""
+        connections_settings = self.__app_settings.mqtt_connections
+        for name in list(self.__mqtt_connections.keys()):
+            if connections_settings.get(name, None) != self.__mqtt_connections_settings.get(name, None):
+                mqtt = self.__mqtt_connections.pop(name)
+                mqtt.stop()
+                MQTTTelegrafSubscription.discard(mqtt)
+        for name, connection_settings in connections_settings.items():
+            if name not in self.__mqtt_connections:
+                mqtt = self.get_mqtt_connection_from_settings(name, connection_settings)
+                if mqtt is not None:
+                    self.__mqtt_connections[name] = mqtt
+        self.__mqtt_connections_settings = copy.deepcopy(connections_settings)
+
+    def get_mqtt_connection_from_config(self, mqtt_settings: Optional[Dict[str, Any]], mqtt_connections: Dict[str, MQTTClient]) -> MQTTClient:
+        name = (mqtt_settings or {}).get('connection', DEFAULT_MQTT_CONNECTION_NAME)
+        mqtt = mqtt_connections.get(name, None)
+        if mqtt is None:
+            raise ValueError(f"Invalid data source MQTT connection: {name} (not declared in the mqtt connections of the configuration)")
+        return mqtt
+
+    def get_widget_data_source_from_config(self, widget_settings: Dict[str, Any], mqtt_connections: Dict[str, MQTTClient], series_name: Optional[str] = None) -> QueueDataSource:
+        data_source = self.__create_data_source_from_config(widget_settings = widget_settings, mqtt_connections = mqtt_connections)
+        # data sources feed their (history) time series if needed (explicit series name, or series_name set by the caller)
+        series_name = widget_settings.get('series', series_name)
+        if series_name is not None:
+            data_source.attach_series(TimeSeriesStore.get(series_name))
+        return data_source
+
+    def __create_data_source_from_config(self, widget_settings: Dict[str, Any], mqtt_connections: Dict[str, MQTTClient]) -> QueueDataSource:
         #return RandomDataSource(0.1)
+        queue = self.get_data_source_queue_from_config(widget_settings.get('queue', None))
+        number_type = DataSourceNumberType.from_string(widget_settings.get('number_type', DataSourceNumberType.FLOAT.value))
+        if widget_settings.get('type', None) in ("cpu_load", "cpu_temperature", "telegraf_field"):
+            mqtt = self.get_mqtt_connection_from_config(widget_settings.get('mqtt', None), mqtt_connections)
         if widget_settings.get('type', None) == "cpu_load":
-            return MQTTTelegrafCPUDataSource(mqtt=mqtt, topic = widget_settings.get('mqtt', {}).get('topic', None))
+            return MQTTTelegrafCPUDataSource(mqtt=mqtt, topic = widget_settings.get('mqtt', {}).get('topic', None), tags = widget_settings.get('tags', None), number_type = number_type, queue = queue)
         elif widget_settings.get('type', None) == "cpu_temperature":
-            return MQTTTelegrafCPUTemperatureDataSource(mqtt=mqtt, topic = widget_settings.get('mqtt', {}).get('topic', None), feature_search = widget_settings.get('mqtt', {}).get('feature_search', "feature=package_id_0"))
+            return MQTTTelegrafCPUTemperatureDataSource(mqtt=mqtt, topic = widget_settings.get('mqtt', {}).get('topic', None), feature_search = widget_settings.get('mqtt', {}).get('feature_search', "feature=package_id_0"), number_type = number_type, queue = queue)
+        elif widget_settings.get('type', None) == "telegraf_field":
+            return MQTTTelegrafDataSource(mqtt=mqtt, topic = widget_settings.get('mqtt', {}).get('topic', None), field = widget_settings.get('field', None), tags = widget_settings.get('tags', None), measurement = widget_settings.get('measurement', None), number_type = number_type, queue = queue)
         else:
             raise ValueError("TODO")
 
@@ -214,10 +330,15 @@ class Boot:
                     source = None
                     url = widget_settings.get('rss_url', None)
                     if url is not None:
-                        source = HorizontalTickerWidgetRSSSource(
-                            cache = RSSCache(base_path=self.__app_settings.cache_path, url=url),
-                            item_count = 16
-                        )
+                        cache = self.__remote_caches.get(RemoteCacheKind.RSS, url)
+                        if cache is not None:
+                            source = HorizontalTickerWidgetRSSSource(
+                                cache = cache,
+                                item_count = 16
+                            )
+                        else:
+                            self.__log.error(f"Cache error in widget {widget_name} rss ({url})")
+                            source = HorizontalTickerWidgetStringSource(text = f"RSS FEED NOT AVAILABLE ({url})")
                     else:
                         source = HorizontalTickerWidgetStringSource(text = widget_settings.get('text', None))
                     self.__widgets.append(
@@ -247,12 +368,11 @@ class Boot:
                     image_path = None
                     url = widget_settings.get('url', None)
                     if url is not None:
-                        try:
-                            cache = RemoteImageCache(base_path=self.__app_settings.cache_path, url=url)
+                        cache = self.__remote_caches.get(RemoteCacheKind.IMAGE, url)
+                        if cache is not None:
                             image_path = cache.full_path
-                        except Exception as e:
+                        else:
                             self.__log.error(f"Cache error in widget {widget_name} remote image ({url})")
-                            self.__log.debug(e)
                     else :
                         image_path = widget_settings.get('path', None)
                     self.__widgets.append(
@@ -262,7 +382,8 @@ class Boot:
                             rect = self.get_widget_rect_from_config(widget_settings),
                             background_color = widget_settings.get('background_color', None),
                             border = self.__app_settings.debug_widgets,
-                            path = image_path
+                            path = image_path,
+                            cache_path = self.__app_settings.cache_path
                         )
                     )
                 elif (widget_settings.get("type", None) == "weather_forecast"):
@@ -330,6 +451,13 @@ class Boot:
                             masked_text = widget_footer_settings.get("masked_text", None),
                             fixed_width = rect.width
                         )
+                    try:
+                        data_source = self.get_widget_data_source_from_config(widget_settings = widget_settings.get('data_source', None), mqtt_connections = self.__mqtt_connections,
+                            # series only fed if read (history mode, or persisted history snapshots)
+                            series_name = widget_name if widget_settings.get('history', None) is not None or self.__history_snapshot is not None else None)
+                    except ValueError as e:
+                        self.__log.error(f"Invalid data source in widget {widget_name}: {e}")
+                        continue
                     self.__widgets.append(
                         LineChartWidget(
                             parent_surface = self.__main_surface,
@@ -341,13 +469,22 @@ class Boot:
                             bottom_legend_block = bottom_legend_block,
                             chart_color = widget_settings.get('chart_color', [ random.randint(64, 255), random.randint(64, 255), random.randint(64, 255)]),
                             chart_fill = True,
-                            data_source = self.get_widget_data_source_from_config(widget_settings = widget_settings.get('data_source', None), mqtt = self.__mqtt),
+                            data_source = data_source,
                             y_axis_min_value = 0,
-                            y_axis_max_value = 100
+                            y_axis_max_value = 100,
+                            history = widget_settings.get('history', None)
                         )
                     )
 
         self.__log.debug(f"Total widgets: {len(self.__widgets)}")
+        self.__update_animations_visibility()
+
+    def __update_animations_visibility(self) -> None:
+        screen_rect = self.__main_surface.get_rect()
+        for index, widget in enumerate(self.__widgets):
+            # widgets are rendered in list order, so only (opaque) widgets rendered later can hide this one
+            occluders = [ next_widget.rect for next_widget in self.__widgets[index + 1:] if next_widget.opaque ]
+            widget.update_animations_visibility(screen_rect, occluders)
 
     def loop(self) -> bool:
         # check for exit
@@ -366,8 +503,16 @@ class Boot:
         if self.__app_settings.debug_widgets and (self.__app_settings.file_changed or self.__skin_settings.file_changed):
             self.__log.info("Configuration file changes detected, reloading widgets")
             self.__load_settings_and_skin()
+            self.__refresh_mqtt_connections()
+            self.__prefetch_remote_caches()
             self.__refresh_background()
             self.__load_widgets()
+        elif self.__remote_caches.pop_recovered():
+            self.__log.info("Remote caches recovered, reloading widgets")
+            self.__refresh_background()
+            self.__load_widgets()
+
+        AnimationManager.begin_frame()
 
         for widget in self.__widgets:
             if self.__click_event is not None:
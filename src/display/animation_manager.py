@@ -0,0 +1,151 @@
+import time
+import weakref
+
+from .fps import FPS
+
+DEFAULT_FRAME_BUDGET_MS = 4.0 # max time (per frame) spent rendering decorative animations
+DEFAULT_MAX_FRAME_DIVISOR = 8 # at max throttle level animations are only updated once every 8 frames
+DEFAULT_RECOVERY_FRAMES = 60 # consecutive frames under target required to lower the throttle level
+DEFAULT_OVERLOAD_FRAMES = 5 # consecutive frames over target required to raise the throttle level
+
+class AnimationManager:
+    """
+    A class to manage (throttle / freeze) decorative animations in a pygame application using static methods.
+
+    Every animated icon registers here. Animations are only updated while there is time left in the
+    per-frame animation budget, they are updated at lower rates while the measured frame time exceeds
+    the target frame time, and paused animations (off-screen / occluded widgets) are never updated,
+    so data widgets always win over decoration.
+    """
+
+    __animations = weakref.WeakKeyDictionary() # animation => paused
+    __frame_budget_ms = DEFAULT_FRAME_BUDGET_MS
+    __max_frame_divisor = DEFAULT_MAX_FRAME_DIVISOR
+    __frame_divisor = 1
+    __frame_count = 0
+    __frames_under_target = 0
+    __frames_over_target = 0
+    __spent_ms = 0.0
+
+    @staticmethod
+    def register(animation: object) -> None:
+        """
+        Registers an animation (registered animations are automatically discarded when garbage collected).
+
+        Args:
+            animation (object): The animation to register.
+        """
+        AnimationManager.__animations[animation] = False
+
+    @staticmethod
+    def unregister(animation: object) -> None:
+        """
+        Unregisters an animation.
+
+        Args:
+            animation (object): The animation to unregister.
+        """
+        AnimationManager.__animations.pop(animation, None)
+
+    @staticmethod
+    def set_paused(animation: object, paused: bool) -> None:
+        """
+        Pauses / resumes a registered animation.
+
+        Args:
+            animation (object): The registered animation.
+            paused (bool): True for pausing the animation, False for resuming it.
+        """
+        if animation in AnimationManager.__animations:
+            AnimationManager.__animations[animation] = paused
+
+    @staticmethod
+    def is_paused(animation: object) -> bool:
+        """
+        Checks if a registered animation is paused.
+
+        Returns:
+            bool: True if the animation is paused.
+        """
+        return AnimationManager.__animations.get(animation, False)
+
+    @staticmethod
+    def get_frame_count() -> int:
+        """
+        Retrieves the current frame number (increased on each begin_frame call).
+
+        Returns:
+            int: The current frame number.
+        """
+        return AnimationManager.__frame_count
+
+    @staticmethod
+    def get_frame_divisor() -> int:
+        """
+        Retrieves the current throttle level (animations are updated once every N frames).
+
+        Returns:
+            int: The current frame divisor.
+        """
+        return AnimationManager.__frame_divisor
+
+    @staticmethod
+    def set_frame_budget(budget_ms: float) -> None:
+        """
+        Updates the max time (in milliseconds) spent rendering animations per frame.
+
+        Args:
+            budget_ms (float): The new per-frame animation budget.
+
+        Raises:
+            ValueError: If budget_ms is not a positive number.
+        """
+        if not isinstance(budget_ms, (int, float)) or budget_ms <= 0:
+            raise ValueError("The animation frame budget must be a positive number.")
+        AnimationManager.__frame_budget_ms = float(budget_ms)
+
+    @staticmethod
+    def begin_frame() -> None:
+        """
+        Starts a new frame: resets the animation budget and adjusts the throttle level using the last measured frame work time
+        (without the framerate limit delay, so a machine keeping up with the target framerate is never throttled).
+        """
+        target_frame_time = 1000 / FPS.get_default_fps()
+        if FPS.get_rawtime() > target_frame_time:
+            AnimationManager.__frames_under_target = 0
+            AnimationManager.__frames_over_target += 1
+            if AnimationManager.__frame_divisor < AnimationManager.__max_frame_divisor and AnimationManager.__frames_over_target >= DEFAULT_OVERLOAD_FRAMES:
+                AnimationManager.__frames_over_target = 0
+                AnimationManager.__frame_divisor *= 2
+        else:
+            AnimationManager.__frames_over_target = 0
+            AnimationManager.__frames_under_target += 1
+            if AnimationManager.__frame_divisor > 1 and AnimationManager.__frames_under_target >= DEFAULT_RECOVERY_FRAMES:
+                AnimationManager.__frames_under_target = 0
+                AnimationManager.__frame_divisor //= 2
+        AnimationManager.__frame_count += 1
+        AnimationManager.__spent_ms = 0.0
+
+    @staticmethod
+    def acquire(animation: object) -> bool:
+        """
+        Checks if an animation can be updated in the current frame.
+
+        Returns:
+            bool: True if the animation is allowed to update (caller must call release after rendering).
+        """
+        if AnimationManager.__animations.get(animation, False):
+            return False
+        if AnimationManager.__frame_count % AnimationManager.__frame_divisor != 0:
+            return False
+        return AnimationManager.__spent_ms < AnimationManager.__frame_budget_ms
+
+    @staticmethod
+    def release(start_time: float) -> None:
+        """
+        Adds the time spent by an animation update to the current frame budget.
+
+        Args:
+            start_time (float): The time.perf_counter() value taken before the animation update.
+        """
+        AnimationManager.__spent_ms += (time.perf_counter() - start_time) * 1000
@@ -45,6 +45,26 @@ class FPS:
         """
         return FPS.__clock.get_time()
 
+    @staticmethod
+    def get_rawtime() -> float:
+        """
+        Retrieves the time in milliseconds spent rendering the last frame (without the framerate limit delay).
+
+        Returns:
+            float: Frame work time in milliseconds.
+        """
+        return FPS.__clock.get_rawtime()
+
+    @staticmethod
+    def get_default_fps() -> int:
+        """
+        Retrieves the default FPS limit.
+
+        Returns:
+            int: The default FPS limit.
+        """
+        return FPS.__default_fps
+
     @staticmethod
     def set_default_fps(fps: int) -> None:
         """
@@ -17,6 +17,7 @@ class FontAwesomeIconBounceEffect(FontAwesomeIconBaseEffect):
         self.__current_y = 0
         self.__last_y = 0
         self.__falling = True
+        self.__scratch_surface = pygame.Surface(self.__real_surface_size, pygame.SRCALPHA) # preallocated buffer (steady-state animation allocates nothing)
         self._set_total_frames(self.__distance * 8)
 
     def _animate(self) -> None:
@@ -41,6 +42,6 @@ class FontAwesomeIconBounceEffect(FontAwesomeIconBaseEffect):
         self.__last_y = int(self.__current_y)
 
     def _render_animation(self) -> pygame.Surface:
-        tmp_surface = pygame.Surface(self.__real_surface_size, pygame.SRCALPHA)
-        tmp_surface.blit(self.__icon_surface, (0, self.__current_y))
-        return tmp_surface
+        self.__scratch_surface.fill((0, 0, 0, 0))
+        self.__scratch_surface.blit(self.__icon_surface, (0, self.__current_y))
+        return self.__scratch_surface
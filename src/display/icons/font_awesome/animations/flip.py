@@ -23,6 +23,9 @@ class FontAwesomeIconFlipEffect(FontAwesomeIconBaseEffect):
         self.__current_height = self.__height
         self.__last_height = self.__current_height
         self.__shrinking = True
+        # preallocated buffers (steady-state animation allocates nothing)
+        self.__scratch_surface = pygame.Surface(self.__real_surface_size, pygame.SRCALPHA)
+        self.__stretched_surfaces = {}
         self._set_total_frames((self.__width if self._animation_type == FontAwesomeAnimationType.HORIZONTAL_FLIP else self.__height) * 4)
 
     def _animate(self) -> None:
@@ -65,12 +68,24 @@ class FontAwesomeIconFlipEffect(FontAwesomeIconBaseEffect):
         else:
             self.__last_height = int(self.__current_height)
 
+    def __get_stretched_surface(self, size: tuple[int, int]) -> pygame.Surface:
+        key = (self.__flip, size)
+        stretched_surface = self.__stretched_surfaces.get(key, None)
+        if stretched_surface is None:
+            # each stretch step (width / height) is scaled only once (in the first animation loop)
+            stretched_surface = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.transform.scale(self.__icon_surface if self.__flip else self.__icon_surface_flipped, size, stretched_surface)
+            self.__stretched_surfaces[key] = stretched_surface
+        return stretched_surface
+
     def _render_animation(self) -> pygame.Surface:
-        tmp_surface = pygame.Surface(self.__real_surface_size, pygame.SRCALPHA)
-        streched_icon = pygame.transform.scale(self.__icon_surface if self.__flip else self.__icon_surface_flipped, (self.__current_width, self.__current_height))
+        current_width = max(1, int(self.__current_width))
+        current_height = max(1, int(self.__current_height))
+        self.__scratch_surface.fill((0, 0, 0, 0))
+        streched_icon = self.__get_stretched_surface((current_width, current_height))
         if self._animation_type == FontAwesomeAnimationType.HORIZONTAL_FLIP:
-            dest = ((self.__width - self.__current_width) // 2, 0)
+            dest = ((self.__width - current_width) // 2, 0)
         else:
-            dest = (0, (self.__height - self.__current_height) // 2)
-        tmp_surface.blit(streched_icon, dest)
-        return tmp_surface
+            dest = (0, (self.__height - current_height) // 2)
+        self.__scratch_surface.blit(streched_icon, dest)
+        return self.__scratch_surface
@@ -4,19 +4,45 @@ from ..icon_animated import IconAnimated as FontAwesomeIconBaseEffect
 from ..icon_list import IconList as FontAwesomeIcons
 from ..enums import AnimationType as FontAwesomeAnimationType, AnimationSpeed as FontAwesomeAnimationSpeed, SpinAnimationDirection as FontAwesomeAnimationSpinDirection
 
+DEFAULT_ROTATION_STEPS = 60 # precomputed rotation steps per turn
+DEFAULT_SUPERSAMPLING = 4 # glyph is rendered at N x size and downscaled while rotating
+
 class FontAwesomeIconSpinEffect(FontAwesomeIconBaseEffect):
-    def __init__(self, parent_surface: pygame.Surface, icon: FontAwesomeIcons, font_path: Optional[str] = None, size: int = 16, color: tuple[int, int, int] = (255, 255, 255), speed: FontAwesomeAnimationSpeed = FontAwesomeAnimationSpeed.MEDIUM, animation_duration_coefficients: tuple[int, int, int] = (1, 2, 4), direction: FontAwesomeAnimationSpinDirection = FontAwesomeAnimationSpinDirection.CLOCKWISE) -> None:
-        super().__init__(parent_surface = parent_surface, icon = icon, font_path = font_path, size = size, color = color, speed = speed, animation_duration_coefficients = animation_duration_coefficients, animation_total_frames = 359)
+    def __init__(self, parent_surface: pygame.Surface, icon: FontAwesomeIcons, font_path: Optional[str] = None, size: int = 16, color: tuple[int, int, int] = (255, 255, 255), speed: FontAwesomeAnimationSpeed = FontAwesomeAnimationSpeed.MEDIUM, animation_duration_coefficients: tuple[int, int, int] = (1, 2, 4), direction: FontAwesomeAnimationSpinDirection = FontAwesomeAnimationSpinDirection.CLOCKWISE, steps: int = DEFAULT_ROTATION_STEPS, supersampling: int = DEFAULT_SUPERSAMPLING) -> None:
+        super().__init__(parent_surface = parent_surface, icon = icon, font_path = font_path, size = size, color = color, speed = speed, speed_durations = animation_duration_coefficients, total_frames = 359)
         if direction == FontAwesomeAnimationSpinDirection.CLOCKWISE:
             self._animation_type = FontAwesomeAnimationType.SPIN_CLOCKWISE
             self.__angle = 0
         else:
             self._animation_type = FontAwesomeAnimationType.SPIN_COUNTERCLOCKWISE
             self.__angle = 360
-        self.__last_angle = self.__angle
+        if steps < 1:
+            raise ValueError(f"Invalid steps value: {steps}.")
+        if supersampling < 1:
+            raise ValueError(f"Invalid supersampling value: {supersampling}.")
+        self.__steps = steps
+        self.__last_step = self.__get_step()
         self.__icon_surface = super().render(self._icon, self._color)
         self.__real_surface_size = self.__icon_surface.get_size()
         self.__icon_surface_center = (self.__icon_surface.get_width() // 2, self.__icon_surface.get_height() // 2)
+        self.__rotated_surfaces = self.__precompute_rotations(size, supersampling)
+
+    def __precompute_rotations(self, size: int, supersampling: int) -> list[pygame.Surface]:
+        # render (once) the glyph at supersampled size, every rotation step is downscaled (with smoothing) from it
+        super().set_size(size * supersampling)
+        supersampled_icon_surface = super().render(self._icon, self._color)
+        super().set_size(size)
+        rotated_surfaces = []
+        for step in range(self.__steps):
+            rotated_icon = pygame.transform.rotozoom(supersampled_icon_surface, step * 360 / self.__steps, 1 / supersampling)
+            # all steps share the same surface size & center (no jittering bounding boxes)
+            step_surface = pygame.Surface(self.__real_surface_size, pygame.SRCALPHA)
+            step_surface.blit(rotated_icon, rotated_icon.get_rect(center = self.__icon_surface_center))
+            rotated_surfaces.append(step_surface)
+        return rotated_surfaces
+
+    def __get_step(self) -> int:
+        return round(self.__angle * self.__steps / 360) % self.__steps
 
     def _animate(self) -> None:
         if self._animation_type == FontAwesomeAnimationType.SPIN_CLOCKWISE:
@@ -30,14 +56,10 @@ class FontAwesomeIconSpinEffect(FontAwesomeIconBaseEffect):
 
     @property
     def _changed(self) -> bool:
-        return self.__last_angle != int(self.__angle)
+        return self.__last_step != self.__get_step()
 
     def _update_changed_values(self) -> None:
-        self.__last_angle = int(self.__angle)
-
-    def render(self) -> bool:
-        tmp_surface = pygame.Surface(self.__real_surface_size, pygame.SRCALPHA)
-        rotated_icon = pygame.transform.rotate(self.__icon_surface, self.__angle)
-        rotated_rect = rotated_icon.get_rect(center = self.__icon_surface_center)
-        tmp_surface.blit(rotated_icon, rotated_rect)
-        return tmp_surface
+        self.__last_step = self.__get_step()
+
+    def _render_animation(self) -> pygame.Surface:
+        return self.__rotated_surfaces[self.__get_step()]
@@ -1,10 +1,12 @@
 from typing import Optional
+import time
 import pygame
 
 from .enums import AnimationType as FontAwesomeAnimationType, AnimationSpeed as FontAwesomeAnimationSpeed
 from .icon_list import IconList as FontAwesomeIcon
 from .icon import Icon
 from ...fps import FPS
+from ...animation_manager import AnimationManager
 
 class IconAnimated(Icon):
     def __init__(self, parent_surface: pygame.Surface, icon: FontAwesomeIcon, font_path: Optional[str] = None, size: int = 16, color: tuple[int, int, int] = (255, 255, 255), speed: FontAwesomeAnimationSpeed = FontAwesomeAnimationSpeed.MEDIUM, speed_durations: tuple[int, int, int] = (1, 2, 4), total_frames: int = 0) -> None:
@@ -16,6 +18,7 @@ class IconAnimated(Icon):
         self._speed = speed
         self.__set_speed_durations(speed_durations)
         self.__total_frames = total_frames
+        AnimationManager.register(self)
 
     def _set_total_frames(self, total_frames: int) -> None:
         self.__total_frames = total_frames
@@ -40,6 +43,8 @@ class IconAnimated(Icon):
             self.__animation_duration = FPS.get_current_fps() * self.__animation_duration_coefficients[2]
         else:
             raise ValueError("Invalid FontAwesome animation speed value.")
+        # throttled animations are updated once every N frames, so (for keeping same speed) duration is measured in updated frames
+        self.__animation_duration /= AnimationManager.get_frame_divisor()
 
 
     def _animate(self) -> None:
@@ -60,10 +65,16 @@ class IconAnimated(Icon):
         raise ValueError(f"You must override this method (_render_animation) in this inherited class.")
 
     def render_animation(self) -> pygame.Surface:
-        self.__animate()
-        if self._changed:
-            surface = self._render_animation()
-            self._update_changed_values()
-            return surface
-        else:
-            return None
\ No newline at end of file
+        if not AnimationManager.acquire(self):
+            return None
+        start_time = time.perf_counter()
+        try:
+            self.__animate()
+            if self._changed:
+                surface = self._render_animation()
+                self._update_changed_values()
+                return surface
+            else:
+                return None
+        finally:
+            AnimationManager.release(start_time)
@@ -0,0 +1,135 @@
+from typing import Optional, Type, Any
+import weakref
+import pygame
+
+from .icon_animated import IconAnimated
+from ...animation_manager import AnimationManager
+
+class IconAnimatedSharedState:
+    """
+    A class to hold one animation state machine (effect) and its rendered output, shared among all identical animated icons.
+
+    The effect is updated at most once per frame (no matter how many icons use it). When some icon requires
+    a phase offset, the last rendered frames are kept in a ring of preallocated surfaces.
+    """
+
+    def __init__(self, effect: IconAnimated) -> None:
+        """
+        Initializes a shared state for an effect.
+
+        Args:
+            effect (IconAnimated): The animation effect (state machine) to share.
+        """
+        self.__effect = effect
+        self.__frame = None
+        self.__generation = 0 # number of rendered (changed) animation frames
+        self.__surface = None
+        self.__ring = []
+        self.__ring_size = 1
+
+    @property
+    def generation(self) -> int:
+        return self.__generation
+
+    def require_phase_offset(self, phase_offset: int) -> None:
+        """
+        Ensures the rendered frames history can serve the specified phase offset.
+
+        Args:
+            phase_offset (int): The phase offset (in rendered animation frames).
+        """
+        if phase_offset < 0:
+            raise ValueError(f"Invalid phase_offset value: {phase_offset}.")
+        self.__ring_size = max(self.__ring_size, phase_offset + 1)
+
+    def update(self) -> None:
+        """
+        Updates the shared effect (only the first call on each frame does the work).
+        """
+        current_frame = AnimationManager.get_frame_count()
+        if self.__frame == current_frame:
+            return
+        self.__frame = current_frame
+        surface = self.__effect.render_animation()
+        if surface is not None:
+            self.__generation += 1
+            if self.__ring_size > 1:
+                if len(self.__ring) != self.__ring_size or self.__ring[0].get_size() != surface.get_size():
+                    self.__ring = [ pygame.Surface(surface.get_size(), pygame.SRCALPHA) for _ in range(self.__ring_size) ]
+                slot = self.__ring[self.__generation % self.__ring_size]
+                slot.fill((0, 0, 0, 0))
+                slot.blit(surface, (0, 0))
+                self.__surface = slot
+            else:
+                self.__surface = surface
+
+    def get_surface(self, phase_offset: int = 0) -> Optional[pygame.Surface]:
+        """
+        Retrieves the rendered frame (with an optional phase offset).
+
+        Args:
+            phase_offset (int): The phase offset (in rendered animation frames).
+
+        Returns:
+            pygame.Surface: The rendered frame or None if no frame was rendered yet.
+        """
+        if phase_offset == 0 or self.__ring_size == 1:
+            return self.__surface
+        if self.__generation <= phase_offset:
+            return None
+        return self.__ring[(self.__generation - phase_offset) % self.__ring_size]
+
+class IconAnimatedShared:
+    """
+    A class to represent an animated icon whose effect is shared among all icons with identical parameters.
+
+    Cost scales with distinct animations, not with icon count (for example a spinning sync icon per device row).
+    """
+
+    # effect class + effect parameters => shared state (discarded when no icon uses it)
+    __states = weakref.WeakValueDictionary()
+
+    def __init__(self, effect_class: Type[IconAnimated], parent_surface: pygame.Surface, phase_offset: int = 0, **kwargs: Any) -> None:
+        """
+        Initializes a shared animated icon.
+
+        Args:
+            effect_class (Type[IconAnimated]): The animation effect class (for example FontAwesomeIconSpinEffect).
+            parent_surface (pygame.Surface): The parent surface.
+            phase_offset (int): Delay (in rendered animation frames) of this icon relative to the other identical icons.
+            **kwargs: The effect parameters (icon, font_path, size, color, speed...).
+        """
+        key = (effect_class, tuple(sorted((name, IconAnimatedShared.__hashable(value)) for name, value in kwargs.items())))
+        state = IconAnimatedShared.__states.get(key, None)
+        if state is None:
+            state = IconAnimatedSharedState(effect_class(parent_surface = parent_surface, **kwargs))
+            IconAnimatedShared.__states[key] = state
+        state.require_phase_offset(phase_offset)
+        self.__state = state
+        self.__phase_offset = phase_offset
+        self.__last_generation = None
+        AnimationManager.register(self)
+
+    @staticmethod
+    def __hashable(value: Any) -> Any:
+        if isinstance(value, list):
+            return tuple(value)
+        return value
+
+    def render_animation(self) -> Optional[pygame.Surface]:
+        """
+        Renders the current (shared) animation frame.
+
+        Returns:
+            pygame.Surface: The animation frame, or None if it did not change since the last call (or the icon is paused).
+        """
+        if AnimationManager.is_paused(self):
+            return None
+        self.__state.update()
+        generation = self.__state.generation
+        if generation == self.__last_generation:
+            return None
+        surface = self.__state.get_surface(self.__phase_offset)
+        if surface is not None:
+            self.__last_generation = generation
+        return surface
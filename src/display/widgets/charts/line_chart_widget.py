@@ -1,14 +1,16 @@
 import pygame
 import random
+import time
 
-from typing import Optional, Any
+from typing import Optional, Any, Sequence
 from .chart_widget import ChartWidget, ChartWidgetHorizontalTextBlock
 from ..widget import DEFAULT_WIDGET_BORDER_COLOR, DEFAULT_WIDGET_COLOR
 from ....modules.data_source.queue_data_source import QueueDataSource
+from ....modules.queue.ring_buffer import SampleRingBuffer, SampleBuffer
 
 class LineChartWidget(ChartWidget):
 
-    def __init__(self, parent_surface: pygame.Surface, name: str, rect: pygame.Rect, background_color: tuple[int, int, int] = None, border: bool = False, border_color: tuple[int, int, int] = DEFAULT_WIDGET_COLOR, top_title_block: Optional[ChartWidgetHorizontalTextBlock] = None, bottom_legend_block: Optional[ChartWidgetHorizontalTextBlock] = None, chart_color: tuple[int, int, int] = DEFAULT_WIDGET_BORDER_COLOR, chart_fill: bool = True, data_source: QueueDataSource = None, y_axis_min_value: Any = 0, y_axis_max_value: Any = 0) -> None:
+    def __init__(self, parent_surface: pygame.Surface, name: str, rect: pygame.Rect, background_color: tuple[int, int, int] = None, border: bool = False, border_color: tuple[int, int, int] = DEFAULT_WIDGET_COLOR, top_title_block: Optional[ChartWidgetHorizontalTextBlock] = None, bottom_legend_block: Optional[ChartWidgetHorizontalTextBlock] = None, chart_color: tuple[int, int, int] = DEFAULT_WIDGET_BORDER_COLOR, chart_fill: bool = True, data_source: QueueDataSource = None, y_axis_min_value: Any = 0, y_axis_max_value: Any = 0, history: Optional[int] = None) -> None:
         super().__init__(parent_surface = parent_surface, name = name, rect = rect, background_color = background_color, border = border, border_color = border_color, top_title_block = top_title_block, bottom_legend_block = bottom_legend_block)
         self._refresh_required = True
         self._chart_color = chart_color
@@ -16,6 +18,13 @@ class LineChartWidget(ChartWidget):
         self.__data_source = data_source
         self._y_axis_min_value = y_axis_min_value
         self._y_axis_max_value = y_axis_max_value
+        # history mode: the chart shows the last history seconds (read from the data source time series), one point by pixel column
+        self.__history = history if history is not None and data_source is not None and data_source.series is not None else None
+        self.__history_last_render = None
+        # reused consumer buffers: ring buffer data sources are drained in one batch by frame (float samples),
+        # queue data sources are dequeued (values kept as is, like Decimal)
+        self.__samples = SampleBuffer()
+        self.__values = []
         self.__min_value = None
         self.__max_value = None
         self.__current_value = None
@@ -38,6 +47,8 @@ class LineChartWidget(ChartWidget):
 
         self.__graph_surface = pygame.Surface((self.width, self._chart_height), pygame.SRCALPHA)
         self.__graph_surface.fill((0, 0, 0, 0))
+        self.__history_surface = pygame.Surface((self.width, self._chart_height), pygame.SRCALPHA) if self.__history is not None else None # reused on every history render
+        self.__seed_graph()
         self.refresh(True)
 
 
@@ -47,29 +58,51 @@ class LineChartWidget(ChartWidget):
     def __map_value(self, value, fromLow, fromHigh, toLow, toHigh):
         return (value - fromLow) * (toHigh - toLow) / (fromHigh - fromLow) + toLow
 
-    def __get_value(self) -> bool:
-        value = self.__data_source.dequeue()
-        #print (value)
-        if value is not None:
-            self.__last_current_value = self.__current_value
-            self.__current_value = value.value
-            if (self.__min_value is not None):
-                if self.__current_value < self.__min_value:
-                    self.__last_min_value = self.__min_value
-                    self.__min_value = self.__current_value
-            else:
-                self.__min_value = self.__current_value
+    def __seed_graph(self) -> None:
+        """Draw the latest samples of the data source series (like restored history), one pixel column by sample."""
+        if self.__history is not None or self.__data_source is None or self.__data_source.series is None:
+            return
+        _, values = self.__data_source.series.raw(self.width)
+        if len(values) > 1:
+            # (the latest sample is drawn by the first refresh)
+            self.__render_graph(values[:-1])
+        for value in values:
+            self.__set_value(value)
+
+    def __get_values(self) -> Sequence[Any]:
+        """Consume every pending value of the data source (oldest first)."""
+        if isinstance(self.__data_source.queue, SampleRingBuffer):
+            self.__samples.clear()
+            self.__data_source.drain_into(self.__samples)
+            values = self.__samples.values
+        else:
+            values = self.__values
+            values.clear()
+            msg = self.__data_source.dequeue()
+            while msg is not None:
+                values.append(msg.value)
+                msg = self.__data_source.dequeue()
+        for value in values:
+            self.__set_value(value)
+        return values
+
+    def __set_value(self, value: Any) -> None:
+        self.__last_current_value = self.__current_value
+        self.__current_value = value
+        if (self.__min_value is not None):
+            if self.__current_value < self.__min_value:
                 self.__last_min_value = self.__min_value
-            if (self.__max_value is not None):
-                if self.__current_value > self.__max_value:
-                    self.__last_max_value = self.__max_value
-                    self.__max_value = self.__current_value
-            else:
-                self.__max_value = self.__current_value
+                self.__min_value = self.__current_value
+        else:
+            self.__min_value = self.__current_value
+            self.__last_min_value = self.__min_value
+        if (self.__max_value is not None):
+            if self.__current_value > self.__max_value:
                 self.__last_max_value = self.__max_value
-            return True
+                self.__max_value = self.__current_value
         else:
-            return False
+            self.__max_value = self.__current_value
+            self.__last_max_value = self.__max_value
 
     def __refresh_top_title_surface(self) -> None:
         if self._top_title_block is not None:
@@ -96,7 +129,25 @@ class LineChartWidget(ChartWidget):
                         max_value = self.__max_value if self.__max_value is not None else 0
                     )
 
-    def __render_graph(self, value: int) -> pygame.Surface:
+    def __render_history_graph(self) -> pygame.Surface:
+        surface = self.__history_surface
+        surface.fill((0, 0, 0, 0))
+        max_y = self._chart_height - 1
+        points = self.__data_source.series.query(duration = self.__history, points = self.width)
+        for x, point in enumerate(points):
+            if point is None:
+                continue
+            min_value, max_value, avg_value = point
+            if self._chart_fill:
+                v = int(self.__map_value(avg_value, self._y_axis_min_value, self._y_axis_max_value, 0, max_y))
+                pygame.draw.line(surface = surface, color = self._chart_color, start_pos = (x, max_y - v), end_pos = (x, max_y), width = 1) # avg (line / fill bg)
+            else:
+                v_min = int(self.__map_value(min_value, self._y_axis_min_value, self._y_axis_max_value, 0, max_y))
+                v_max = int(self.__map_value(max_value, self._y_axis_min_value, self._y_axis_max_value, 0, max_y))
+                pygame.draw.line(surface = surface, color = self._chart_color, start_pos = (x, max_y - v_max), end_pos = (x, max_y - v_min), width = 1) # min / max range
+        return surface
+
+    def __render_graph(self, values: Sequence[Any]) -> pygame.Surface:
         surface = pygame.Surface((self.width, self._chart_height), pygame.SRCALPHA)
         surface.fill((0, 0, 0, 0))
 
@@ -113,22 +164,35 @@ class LineChartWidget(ChartWidget):
         current_x = self.__graph_surface.get_width() -1
         max_y = self.__graph_surface.get_height() - 1
 
-        v = int(self.__map_value(value, self._y_axis_min_value, self._y_axis_max_value, 0, max_y))
-        #print(f"Value: {value} - Mapped value: {v} - {0} a {y}, {self._y_axis_min_value} a {self._y_axis_max_value}")
+        # one pixel column by value
+        for index, value in enumerate(values):
+            if index > 0:
+                self.__graph_surface.scroll(dx = -1, dy = 0)
 
-        pygame.draw.line(surface = self.__graph_surface, color = (0, 0, 0, 0), start_pos = (current_x, 0), end_pos = (current_x, max_y), width = 1) # clear previous value (with transparent vertical line)
+            v = int(self.__map_value(int(value), self._y_axis_min_value, self._y_axis_max_value, 0, max_y))
+            #print(f"Value: {value} - Mapped value: {v} - {0} a {y}, {self._y_axis_min_value} a {self._y_axis_max_value}")
 
-        if self._chart_fill:
-            pygame.draw.line(surface = self.__graph_surface, color = self._chart_color, start_pos = (current_x, max_y - v ), end_pos = (current_x, max_y), width = 1) # draw current value (line / fill bg)
-        else:
-            self.__graph_surface.set_at((current_x, max_y - v), self._chart_color) # draw current value (pixel)
+            pygame.draw.line(surface = self.__graph_surface, color = (0, 0, 0, 0), start_pos = (current_x, 0), end_pos = (current_x, max_y), width = 1) # clear previous value (with transparent vertical line)
+
+            if self._chart_fill:
+                pygame.draw.line(surface = self.__graph_surface, color = self._chart_color, start_pos = (current_x, max_y - v ), end_pos = (current_x, max_y), width = 1) # draw current value (line / fill bg)
+            else:
+                self.__graph_surface.set_at((current_x, max_y - v), self._chart_color) # draw current value (pixel)
         # dump
         surface.blit(source = self.__graph_surface, dest=(0, 0))
         self.__graph_surface.scroll(dx = -1, dy = 0) # scroll (left) current value (vertical line) 1 pixel
         return surface
 
     def refresh(self, force: bool = False) -> bool:
-        self._refresh_required = self.__get_value()
+        values = self.__get_values()
+        if self.__history is not None:
+            # pending values are only consumed (history is fed at ingestion), re-render once by point (pixel column) duration
+            now = time.time()
+            self._refresh_required = self.__history_last_render is None or now - self.__history_last_render >= self.__history / self.width
+            if force or self._refresh_required:
+                self.__history_last_render = now
+        else:
+            self._refresh_required = len(values) > 0
         if force or self._refresh_required:
             super()._clear()
             if self._top_title_block is not None:
@@ -139,7 +203,10 @@ class LineChartWidget(ChartWidget):
                 if not self._bottom_legend_block.has_static_text:
                     self.__refresh_bottom_legend_surface()
                 super()._blit(self.__bottom_legend_surface, (0, self.height - self.__bottom_legend_surface.get_height()))
-            super()._blit(self.__render_graph(int(self.__current_value if self.__current_value is not None else 0)), (0, self.__graph_surface_y_offset))
+            if self.__history is not None:
+                super()._blit(self.__render_history_graph(), (0, self.__graph_surface_y_offset))
+            else:
+                super()._blit(self.__render_graph(values if len(values) > 0 else [ self.__current_value if self.__current_value is not None else 0 ]), (0, self.__graph_surface_y_offset))
             super()._render()
             return True
         else:
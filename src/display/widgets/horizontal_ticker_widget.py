@@ -50,14 +50,26 @@ class HorizontalTickerWidgetRSSSource(HorizontalTickerWidgetSource):
         self.__cache = cache
         self.__item_count = item_count
         self.__last_change = None
+        self.__update = None
         self.reload()
+        # refreshed feed data is pushed by the (shared) cache
+        self.__cache.subscribe(self.__on_cache_update)
+
+    def __on_cache_update(self, rss_data) -> None:
+        self.__update = rss_data
 
     def changed(self) -> bool:
-        return self.__last_change != self.__cache.last_change
+        return self.__update is not None or self.__last_change != self.__cache.last_change
 
     def reload(self) -> None:
-        rss_data = self.__cache.load()
+        rss_data, self.__update = self.__update, None
+        if rss_data is None:
+            rss_data = self.__cache.load()
         self.__last_change = self.__cache.last_change
+        if rss_data is None:
+            if self._text is None:
+                self._text = "RSS FEED NOT AVAILABLE"
+            return
         self._text = " # ".join(f"[{item['published']}] - {item['title']}" for item in rss_data['items'][:self.__item_count])
 
 class HorizontalTickerWidget(Widget):
@@ -3,20 +3,30 @@ import pygame
 import os
 
 from .widget import Widget, DEFAULT_WIDGET_BORDER_COLOR
+from ...modules.cache.decoded_image import DecodedImageCache, ImageScalingMode
 
 class ImageWidget(Widget):
 
-    def __init__(self, parent_surface: pygame.Surface, name: str, rect: pygame.Rect, background_color: tuple[int, int, int] = None, border: bool = False, border_color: tuple[int, int, int] = DEFAULT_WIDGET_BORDER_COLOR, path: Optional[str] = None) -> None:
+    def __init__(self, parent_surface: pygame.Surface, name: str, rect: pygame.Rect, background_color: tuple[int, int, int] = None, border: bool = False, border_color: tuple[int, int, int] = DEFAULT_WIDGET_BORDER_COLOR, path: Optional[str] = None, cache_path: Optional[str] = None) -> None:
         super().__init__(parent_surface = parent_surface, name = name, rect = rect, background_color = background_color, border = border, border_color = border_color)
         self.__image = None
-        if path is None:
-            raise ValueError(f"Image path not set")
-        self._log.debug(f"Using local path {path}")
-        self.__load(path)
+        self.__cache_path = cache_path
+        if path is not None:
+            self._log.debug(f"Using local path {path}")
+            self.__load(path)
+        else:
+            self._log.warning(f"Image path not set (showing placeholder)")
         self._render_required = True
 
     def __load(self, path: str):
         if os.path.exists(path):
+            if self.__cache_path is not None:
+                try:
+                    # decoded (pre-scaled) pixels cache: no decoding / scaling when loading again the same image
+                    self.__image = DecodedImageCache(base_path = self.__cache_path, source_path = path, target_size = (self.width, self.height), scaling_mode = ImageScalingMode.FIT).load_surface()
+                    return
+                except Exception as e:
+                    self._log.warning(f"Error loading decoded image cache of {path}: {e}")
             self.__image = pygame.image.load(path)
             original_width, original_height = self.__image.get_size()
             if original_width > self.width or original_height > self.height:
@@ -31,10 +41,12 @@ class ImageWidget(Widget):
 
     def refresh(self, force: bool = False) -> bool:
         if force or self._render_required:
-            if self.__image is None:
-                raise ValueError("No image loaded.")
             self._render_required = False
             super()._clear()
+            if self.__image is None:
+                # placeholder (empty widget area)
+                super()._render()
+                return True
             available_width = self.width
             available_height = self.height
             offset_x = (available_width - self.__image.get_width()) // 2
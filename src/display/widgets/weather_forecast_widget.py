@@ -6,6 +6,7 @@ from .widget import Widget, DEFAULT_WIDGET_BORDER_COLOR
 from .widget_font import WidgetFont
 from ..icons.font_awesome.icon_list import IconList as FontAwesomeIcons
 from ..icons.font_awesome.icon import Icon as FontAwesomeIcon
+from ..icons.font_awesome.icon_animated_shared import IconAnimatedShared as FontAwesomeIconAnimatedShared
 
 from ..icons.font_awesome.enums import AnimationSpeed as FontAwesomeAnimationSpeed, FlipAnimationAxis as FontAwesomeAnimationFlipAxis, SpinAnimationDirection as FontAwesomeAnimationSpinDirection
 from ..icons.font_awesome.animations.beat import FontAwesomeIconBeatEffect
@@ -25,7 +26,8 @@ class WeatherForecastWidget(Widget):
         if not text:
             raise RuntimeError("Text not set")
         self.__text = text
-        self._icon = FontAwesomeIconBounceEffect(parent_surface = self.parent_surface,
+        self._icon = FontAwesomeIconAnimatedShared(FontAwesomeIconBounceEffect,
+                                               parent_surface = self.parent_surface,
                                                icon = FontAwesomeIcons.ICON_CLOUD_BOLT,
                                                font_path= "resources/fonts/fa-solid-900.ttf",
                                                size = 50,
@@ -35,6 +37,11 @@ class WeatherForecastWidget(Widget):
                                                #axis = FontAwesomeAnimationFlipAxis.HORIZONTAL
                                                #direction = FontAwesomeAnimationSpinDirection.CLOCKWISE
         )
+        super()._attach_animation(self._icon)
+        self.__icon_position = (0, 50)
+        self.__icon_surface = None
+        self.__icon_rect = None
+        self.__static_surface = None # cached static layer (header text + hourly grid), animated icons are composited over it
 
     def __blit_defaults(self):
         super()._blit(self.__font.render(self.__text))
@@ -62,16 +69,32 @@ class WeatherForecastWidget(Widget):
             super()._blit(ic.render(random.choice(icons3), (random.randint(100, 255), random.randint(100, 255), random.randint(100, 255))), (x+270, y+8))
             y+= 60
 
+    def __render_static_layer(self):
+        super()._clear()
+        self.__blit_defaults()
+        self.__static_surface = self._tmp_surface.copy()
+
     def refresh(self, force: bool = False) -> bool:
         icon_surface = self._icon.render_animation()
+        if icon_surface is not None:
+            self.__icon_surface = icon_surface
         self._render_required = icon_surface is not None
-        if force or self._render_required:
-            super()._clear()
-            self.__blit_defaults()
-            if icon_surface is not None:
-                super()._blit(icon_surface, (0, 50))
+        if force or self.__static_surface is None:
+            self.__render_static_layer()
+            if self.__icon_surface is not None:
+                super()._blit(self.__icon_surface, self.__icon_position)
+                self.__icon_rect = self.__icon_surface.get_rect(topleft = self.__icon_position)
             super()._render()
             return True  # Indicate that the widget was rendered successfully
+        elif self._render_required:
+            # only the icon bounding box (current + previous) is restored from the static layer & updated
+            icon_rect = icon_surface.get_rect(topleft = self.__icon_position)
+            dirty_rect = icon_rect.union(self.__icon_rect) if self.__icon_rect is not None else icon_rect
+            super()._restore_area(self.__static_surface, dirty_rect)
+            super()._blit(icon_surface, self.__icon_position)
+            super()._render_area(dirty_rect)
+            self.__icon_rect = icon_rect
+            return True
         else:
             return False  # Return False if the widget doesn't need a refresh
 
@@ -2,6 +2,7 @@ import pygame
 from abc import ABC, abstractmethod
 from typing import Optional
 from ...utils.logger import Logger
+from ..animation_manager import AnimationManager
 
 DEFAULT_WIDGET_BORDER_COLOR=(255, 105, 180) # PINK
 DEFAULT_WIDGET_COLOR=(255, 255, 255) # WHITE
@@ -19,6 +20,7 @@ class Widget(ABC):
         self.__border = border
         self.__border_color = border_color
         self._tmp_surface = pygame.Surface((self.width, self.height), pygame.SRCALPHA if background_color is None else 0)
+        self.__animations = []
 
     @property
     def parent_surface(self) -> pygame.Surface:
@@ -28,6 +30,14 @@ class Widget(ABC):
     def name(self) -> str:
         return self.__name
 
+    @property
+    def rect(self) -> pygame.Rect:
+        return self.__rect.copy()
+
+    @property
+    def opaque(self) -> bool:
+        return self.__background_color is not None
+
     @property
     def x(self) -> str:
         return self.__rect.x
@@ -62,6 +72,30 @@ class Widget(ABC):
         self.__parent_surface.blit(self._tmp_surface, self.__rect)
         pygame.display.update(self.__rect) # update only the widget area
 
+    def _restore_area(self, surface: pygame.Surface, rect: pygame.Rect):
+        self._tmp_surface.fill((0, 0, 0, 0), rect)
+        self._tmp_surface.blit(surface, rect, area = rect, special_flags = pygame.BLEND_RGBA_MAX) # exact copy of cached layer pixels (including alpha)
+
+    def _render_area(self, rect: pygame.Rect):
+        area = rect.clip(self._tmp_surface.get_rect())
+        if area.width == 0 or area.height == 0:
+            return
+        dest = area.move(self.__rect.x, self.__rect.y)
+        self.__parent_surface.blit(self.__sub_surface, dest, area = area) # clear previous dirty area (restoring with original area)
+        if self.__border:
+            pygame.draw.rect(self._tmp_surface, self.__border_color, (0, 0, self.width , self.height), 1)
+        self.__parent_surface.blit(self._tmp_surface, dest, area = area)
+        pygame.display.update(dest) # update only the dirty area
+
+    def _attach_animation(self, animation: object) -> None:
+        self.__animations.append(animation)
+
+    def update_animations_visibility(self, screen_rect: pygame.Rect, occluders: list[pygame.Rect]) -> None:
+        """Pause animations of this widget if it is off-screen or fully covered by (opaque) occluder widgets."""
+        visible = self.__rect.colliderect(screen_rect) and not any(occluder.contains(self.__rect) for occluder in occluders)
+        for animation in self.__animations:
+            AnimationManager.set_paused(animation, not visible)
+
     @abstractmethod
     def refresh(self, force: bool = False) -> bool:
         pass
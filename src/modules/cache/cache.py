@@ -1,18 +1,32 @@
-from typing import Any, Optional
+from typing import Any, Callable, Dict, List, Optional
 from abc import abstractmethod
 import os
-import pickle
+import json
+import struct
+import tempfile
 import time
+import zlib
 from ...utils.logger import Logger
 from pathlib import Path
 import threading
+import weakref
+from .scheduler import CacheRefreshScheduler
+from .memory import MemoryCacheTier
+from .manager import CacheManager
+from .serializer import CacheSerializer, JSONCacheSerializer
+from .registry import CacheFlight
+
+# cache file header: magic, format version, serializer format id, payload crc32, payload length, creation timestamp
+CACHE_FILE_HEADER = struct.Struct("<6sBBIQd")
+CACHE_FILE_MAGIC = b"PYSHDB"
+CACHE_FILE_VERSION = 1
 
 class CacheError(Exception):
     """Custom exception for cache-related errors."""
     pass
 
 class ModuleCache:
-    def __init__(self, base_path: str, filename: str, expiration: Optional[int] = None, purge_expired: bool = True) -> None:
+    def __init__(self, base_path: str, filename: str, expiration: Optional[int] = None, purge_expired: bool = True, stale_while_revalidate: bool = False, max_age: Optional[int] = None, serializer: Optional[CacheSerializer] = None) -> None:
         """
         Initialize the cache module.
 
@@ -20,14 +34,30 @@ class ModuleCache:
         :param filename: The name of the cache file.
         :param expiration: Time-to-live (TTL) for the cache, in seconds. If None, the cache never expires.
         :param purge_expired: If True, expired cache files will be automatically removed.
+        :param stale_while_revalidate: If True, expired (stale) data is still served while a background refresh is scheduled.
+        :param max_age: Hard max age (in seconds) of stale data, older data is dropped. If None, stale data is always served.
+        :param serializer: The payload serializer (JSON by default).
         """
         self._log = Logger()
         self.__base_path = os.path.normpath(Path(base_path)) + os.sep
         self.__check_base_path(self.__base_path)
         self.__fullpath = Path(os.path.join(base_path, filename))
+        self.__validators_path = Path(os.path.join(base_path, f"{filename}.validators"))
         self.__expiration = expiration
         self.__purge_expired = purge_expired
+        self.__stale_while_revalidate = stale_while_revalidate
+        self.__max_age = max_age
+        self.__serializer = serializer if serializer is not None else JSONCacheSerializer()
+        self.__revalidation_pending = False
         self.__last_change = None
+        # cache file modification time is kept in memory (stat only once), cached data goes through the in-memory tier
+        self.__mtime = None
+        self.__mtime_known = False
+        # concurrent refreshes (scheduler, revalidation, checks) share one in-flight fetch, results are fanned out to subscribers
+        self.__flight_lock = threading.Lock()
+        self.__flight: Optional[CacheFlight] = None
+        self.__subscribers: List[Any] = []
+        CacheManager().register(self, self.__fullpath)
 
     def __check_base_path(self, path: str) -> None:
         """Ensure the cache directory exists. Create it if it doesn't exist."""
@@ -45,12 +75,30 @@ class ModuleCache:
                 os.remove(self.__fullpath)
                 self._log.info(f"Cache file ({self.__fullpath}) removed.")
                 self.__last_change = None
+                self.__set_mtime(None)
+                MemoryCacheTier.remove(str(self.__fullpath))
+                if os.path.exists(self.__validators_path):
+                    os.remove(self.__validators_path)
             except (OSError, IOError) as e:
                 raise CacheError(f"Failed to remove cache file ({self.__fullpath}): {e}")
 
+    def __get_mtime(self) -> Optional[float]:
+        if not self.__mtime_known:
+            try:
+                self.__mtime = os.path.getmtime(self.__fullpath)
+            except OSError:
+                self.__mtime = None
+            self.__mtime_known = True
+        return self.__mtime
+
+    def __set_mtime(self, mtime: Optional[float]) -> None:
+        self.__mtime = mtime
+        self.__mtime_known = True
+
     @property
     def full_path(self) -> str:
         """Get the full path to the cache file."""
+        CacheManager().record_access(self.__fullpath)
         return self.__fullpath
 
     @property
@@ -62,7 +110,7 @@ class ModuleCache:
     def exists(self) -> bool:
         """Check if the cache file exists."""
         try:
-            return os.path.exists(self.__fullpath)
+            return self.__get_mtime() is not None
         except Exception as e:
             self._log.error(f"Error checking if cache file exists: {e}")
             return False
@@ -80,23 +128,137 @@ class ModuleCache:
                 return False
             if self.__expiration is None:
                 return True
-            file_mod_time = os.path.getmtime(self.__fullpath)
-            return (time.time() - file_mod_time) < self.__expiration
+            return (time.time() - self.__get_mtime()) < self.__expiration
         except Exception as e:
             self._log.error(f"Error checking cache validity: {e}")
             return False
 
+    @property
+    def age(self) -> Optional[float]:
+        """Get the age (in seconds) of the cache file (None if it does not exist)."""
+        mtime = self.__get_mtime()
+        return time.time() - mtime if mtime is not None else None
+
+    @property
+    def stale(self) -> bool:
+        """
+        Check if the cache file is stale (expired, but still usable in stale-while-revalidate mode).
+
+        Returns:
+            True if the cache exists, has expired and has not reached the hard max age; otherwise, False.
+        """
+        if not self.__stale_while_revalidate or self.__expiration is None:
+            return False
+        age = self.age
+        if age is None or age < self.__expiration:
+            return False
+        return self.__max_age is None or age < self.__max_age
+
+    def revalidate(self) -> None:
+        """Schedule a background refresh of the cache (only one pending refresh at a time)."""
+        if not self.__revalidation_pending:
+            self.__revalidation_pending = True
+            self._log.info(f"Cache ({self.__fullpath}) is stale, scheduling background refresh.")
+            CacheRefreshScheduler().refresh_once(self)
+
+    def scheduled_refresh(self) -> None:
+        """Refresh the cache (called from the CacheRefreshScheduler worker threads)."""
+        try:
+            self._single_flight_refresh()
+        finally:
+            self.__revalidation_pending = False
+
+    def subscribe(self, callback: Callable[[Any], None]) -> None:
+        """
+        Subscribe to cache updates (called, from the refreshing thread, with the loaded data after every refresh that saved new data).
+
+        Bound methods are referenced weakly (subscribers are dropped when their owner is garbage collected).
+
+        :param callback: The update callback.
+        """
+        with self.__flight_lock:
+            self.__subscribers.append(weakref.WeakMethod(callback) if hasattr(callback, "__self__") else (lambda: callback))
+
+    def __publish(self) -> None:
+        with self.__flight_lock:
+            callbacks = [ subscriber() for subscriber in self.__subscribers ]
+            self.__subscribers = [ subscriber for subscriber, callback in zip(self.__subscribers, callbacks) if callback is not None ]
+        callbacks = [ callback for callback in callbacks if callback is not None ]
+        if len(callbacks) > 0:
+            # one load (parse) for every subscriber
+            data = self.load()
+            for callback in callbacks:
+                try:
+                    callback(data)
+                except Exception as e:
+                    self._log.error(f"Error notifying cache ({self.__fullpath}) subscriber: {e}")
+
+    def _single_flight_refresh(self) -> None:
+        """Refresh the cache, or wait for the refresh already in flight (its error, if any, is raised to every waiter)."""
+        with self.__flight_lock:
+            flight = self.__flight
+            leader = flight is None
+            if leader:
+                flight = self.__flight = CacheFlight()
+        if not leader:
+            flight.wait()
+            return
+        last_change = self.__last_change
+        error = None
+        try:
+            self._refresh()
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            with self.__flight_lock:
+                self.__flight = None
+            flight.resolve(error = error)
+        if self.__last_change != last_change:
+            self.__publish()
+
+    def __write_atomic(self, path: Path, data: bytes) -> None:
+        """Write a file through a temp file + fsync + rename, so a power cut never leaves a truncated file."""
+        fd, tmp_path = tempfile.mkstemp(dir = self.__base_path, prefix = ".", suffix = ".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def __discard(self, reason: str) -> None:
+        self._log.warning(f"Discarding cache file ({self.__fullpath}): {reason}")
+        try:
+            os.remove(self.__fullpath)
+        except OSError:
+            pass
+        self.__set_mtime(None)
+        MemoryCacheTier.remove(str(self.__fullpath))
+
     def save(self, data: Any) -> bool:
         """
-        Save data to the cache file using pickle serialization.
+        Save data to the cache file (atomic write) using the configured serializer.
 
         :param data: The data to be cached.
         :return: True if the data was saved successfully, otherwise False.
         """
         try:
-            with open(self.__fullpath, "wb") as cache_file:
-                pickle.dump(data, cache_file)
+            serialized_data = self.__serializer.dumps(data)
+            if self.__serializer.headerless:
+                file_data = serialized_data
+            else:
+                file_data = CACHE_FILE_HEADER.pack(CACHE_FILE_MAGIC, CACHE_FILE_VERSION, self.__serializer.format_id, zlib.crc32(serialized_data), len(serialized_data), time.time()) + serialized_data
+            self.__write_atomic(self.__fullpath, file_data)
             self.__last_change = time.time()
+            self.__set_mtime(self.__last_change)
+            MemoryCacheTier.put(str(self.__fullpath), data, len(serialized_data))
             self._log.info(f"Cache saved to ({self.__fullpath})")
             return True
         except Exception as e:
@@ -104,7 +266,7 @@ class ModuleCache:
 
     def save_bytes(self, data: bytes) -> bool:
         """
-        Save raw bytes to the cache file.
+        Save raw bytes to the cache file (atomic write, without header).
 
         :param data: Bytes to be saved in the cache.
         :return: True if the bytes were saved successfully, otherwise False.
@@ -113,9 +275,10 @@ class ModuleCache:
             self._log.error(f"Expected bytes data, got {type(data)}")
             return False
         try:
-            with open(self.__fullpath, "wb") as cache_file:
-                cache_file.write(data)
+            self.__write_atomic(self.__fullpath, data)
             self.__last_change = time.time()
+            self.__set_mtime(self.__last_change)
+            MemoryCacheTier.remove(str(self.__fullpath))
             self._log.info(f"Cache saved to ({self.__fullpath})")
             return True
         except Exception as e:
@@ -123,20 +286,109 @@ class ModuleCache:
 
     def load(self) -> Optional[Any]:
         """
-        Load data from the cache file using pickle deserialization.
+        Load data from the in-memory tier, or from the cache file using the configured serializer (on a miss).
 
-        :return: The cached data if it exists and is valid; otherwise, None.
+        Data returned from the in-memory tier is shared, callers must not modify it.
+        Corrupted / incompatible cache files are discarded.
+
+        :return: The cached data if it exists and is valid (or stale in stale-while-revalidate mode); otherwise, None.
         """
         if not self.valid:
-            self._log.warning(f"Cache file ({self.__fullpath}) is missing or expired.")
-            return None
+            if self.stale:
+                # serve last good payload immediately, refresh in background
+                self.revalidate()
+            else:
+                self._log.warning(f"Cache file ({self.__fullpath}) is missing or expired.")
+                return None
+        CacheManager().record_access(self.__fullpath)
+        hit, data = MemoryCacheTier.get(str(self.__fullpath))
+        if hit:
+            return data
         try:
             with open(self.__fullpath, "rb") as cache_file:
-                data = pickle.load(cache_file)
-            self._log.info(f"Cache ({self.__fullpath}) loaded successfully.")
-            return data
+                file_data = cache_file.read()
         except Exception as e:
             raise CacheError(f"Error loading cache ({self.__fullpath}): {e}")
+        if self.__serializer.headerless:
+            serialized_data = file_data
+        else:
+            if len(file_data) < CACHE_FILE_HEADER.size:
+                self.__discard("truncated header")
+                return None
+            magic, version, format_id, checksum, length, _ = CACHE_FILE_HEADER.unpack_from(file_data)
+            serialized_data = file_data[CACHE_FILE_HEADER.size:]
+            if magic != CACHE_FILE_MAGIC or version != CACHE_FILE_VERSION or format_id != self.__serializer.format_id:
+                self.__discard("unsupported format")
+                return None
+            if length != len(serialized_data) or checksum != zlib.crc32(serialized_data):
+                self.__discard("checksum mismatch")
+                return None
+        try:
+            data = self.__serializer.loads(serialized_data)
+        except Exception as e:
+            self.__discard(f"invalid payload ({e})")
+            return None
+        MemoryCacheTier.put(str(self.__fullpath), data, len(serialized_data))
+        self._log.info(f"Cache ({self.__fullpath}) loaded successfully.")
+        return data
+
+    def load_validators(self) -> Dict[str, str]:
+        """
+        Load the HTTP validators (ETag / Last-Modified) stored alongside the cached payload.
+
+        :return: A dictionary with the stored validators (empty if the payload or validators are missing).
+        """
+        if not self.exists or not os.path.exists(self.__validators_path):
+            return {}
+        try:
+            with open(self.__validators_path, "r") as validators_file:
+                return json.load(validators_file)
+        except Exception as e:
+            self._log.warning(f"Error loading cache validators ({self.__validators_path}): {e}")
+            return {}
+
+    def save_validators(self, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Store the HTTP validators (ETag / Last-Modified) of the cached payload.
+
+        :param etag: The ETag response header value.
+        :param last_modified: The Last-Modified response header value.
+        """
+        validators = {}
+        if etag:
+            validators["etag"] = etag
+        if last_modified:
+            validators["last_modified"] = last_modified
+        try:
+            if validators:
+                self.__write_atomic(self.__validators_path, json.dumps(validators).encode("utf-8"))
+            elif os.path.exists(self.__validators_path):
+                os.remove(self.__validators_path)
+        except Exception as e:
+            self._log.warning(f"Error saving cache validators ({self.__validators_path}): {e}")
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """
+        Build the conditional request headers (If-None-Match / If-Modified-Since) for revalidating the cached payload.
+
+        :return: A dictionary with the conditional request headers (empty if there is nothing to revalidate).
+        """
+        validators = self.load_validators()
+        headers = {}
+        if "etag" in validators:
+            headers["If-None-Match"] = validators["etag"]
+        if "last_modified" in validators:
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def touch(self) -> None:
+        """Bump the freshness of the cached payload (remote not modified) without rewriting it."""
+        try:
+            os.utime(self.__fullpath, None)
+            self.__set_mtime(time.time())
+            self._log.info(f"Cache ({self.__fullpath}) revalidated (not modified).")
+        except Exception as e:
+            raise CacheError(f"Error updating cache modification time ({self.__fullpath}): {e}")
 
     @abstractmethod
     def _refresh(self, force: bool = False) -> None:
@@ -152,19 +404,22 @@ class ModuleCache:
         Check the validity of the cache and refresh it periodically if expiration is set.
 
         If expiration is None, the cache will only be refreshed if it's invalid.
+        Periodic refreshes are served by the shared CacheRefreshScheduler (no thread per cache).
         """
-        def refresh_periodically(stop_event):
-            while not stop_event.is_set():
-                time.sleep(self.__expiration)
-                self._refresh()
-
         if self.__expiration is not None:
-            if not self.valid:
-                self._refresh()
+            if self.stale:
+                # do not wait on the network for stale data
+                self.revalidate()
+            elif not self.valid:
+                self._single_flight_refresh()
             if not hasattr(self, "_stop_event"):
                 self._stop_event = threading.Event()
-                thread = threading.Thread(target=refresh_periodically, args=(self._stop_event,), daemon=True)
-                thread.start()
+                CacheRefreshScheduler().register(self, self.__expiration)
         else:
             if not self.valid:
-                self._refresh()
\ No newline at end of file
+                self._single_flight_refresh()
+
+    def stop(self) -> None:
+        """Stop periodic refreshes of this cache."""
+        if hasattr(self, "_stop_event"):
+            self._stop_event.set()
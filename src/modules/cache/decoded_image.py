@@ -0,0 +1,96 @@
+from typing import Tuple
+from enum import Enum
+import os
+import hashlib
+import mmap
+import struct
+import pygame
+
+from .cache import ModuleCache, CacheError
+from .serializer import BytesCacheSerializer
+
+class DecodedImageCacheError(CacheError):
+    """Custom exception for DecodedImageCache-related errors."""
+    pass
+
+class ImageScalingMode(Enum):
+    STRETCH = 1 # scale to target size (ignoring aspect ratio)
+    FIT = 2 # downscale (keeping aspect ratio) only if the image does not fit into target size
+
+# decoded image file header: width, height (followed by raw pixels)
+DECODED_IMAGE_HEADER = struct.Struct("<II")
+SOURCE_HASH_CHUNK_SIZE = 1024 * 1024
+
+class DecodedImageCache(ModuleCache):
+    def __init__(self, base_path: str, source_path: str, target_size: Tuple[int, int], scaling_mode: ImageScalingMode = ImageScalingMode.STRETCH, pixel_format: str = "RGB") -> None:
+        """
+        Initialize the decoded image cache (pre-scaled raw pixels, so decoding & scaling run once per asset and resolution).
+
+        :param base_path: The base directory where cache files are stored.
+        :param source_path: The source (encoded) image path.
+        :param target_size: The target size (width, height).
+        :param scaling_mode: The scaling mode.
+        :param pixel_format: The stored pixel format (pygame.image.tobytes format, like "RGB" or "RGBA").
+        """
+        if not os.path.exists(source_path):
+            raise ValueError(f"Image {source_path} not found")
+        # source hash only changes when the source image content changes (not on remote cache revalidations, which bump the file modification time)
+        source_hash = DecodedImageCache.__hash_file(source_path)[:32]
+        super().__init__(base_path=os.path.join(base_path, "decoded"),
+                         filename=f"{source_hash}_{target_size[0]}x{target_size[1]}_{scaling_mode.name.lower()}_{pixel_format.lower()}.pixels",
+                         expiration=None,
+                         serializer=BytesCacheSerializer())
+        self.__source_path = source_path
+        self.__target_size = target_size
+        self.__scaling_mode = scaling_mode
+        self.__pixel_format = pixel_format
+        self.__bytes_per_pixel = len(pixel_format)
+        super()._check()
+
+    @staticmethod
+    def __hash_file(path: str) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as source_file:
+            for chunk in iter(lambda: source_file.read(SOURCE_HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _refresh(self) -> None:
+        try:
+            image = pygame.image.load(self.__source_path)
+            original_width, original_height = image.get_size()
+            if self.__scaling_mode == ImageScalingMode.STRETCH:
+                image = pygame.transform.scale(image, self.__target_size)
+            elif original_width > self.__target_size[0] or original_height > self.__target_size[1]:
+                scale_factor = min(self.__target_size[0] / original_width, self.__target_size[1] / original_height)
+                image = pygame.transform.scale(image, (int(original_width * scale_factor), int(original_height * scale_factor)))
+            self._log.debug(f"Decoded {self.__source_path} ({original_width}x{original_height} => {image.get_width()}x{image.get_height()}).")
+            if not self.save_bytes(DECODED_IMAGE_HEADER.pack(image.get_width(), image.get_height()) + pygame.image.tobytes(image, self.__pixel_format)):
+                raise DecodedImageCacheError(f"Error saving decoded image cache of {self.__source_path}")
+        except pygame.error as e:
+            raise DecodedImageCacheError(f"Error decoding image {self.__source_path}: {e}")
+
+    def load_surface(self) -> pygame.Surface:
+        """
+        Load the decoded image (memory-mapped raw pixels, no decoding / scaling).
+
+        :return: The image surface (converted to display format if a display mode is set).
+        """
+        for retry in range(2):
+            try:
+                with open(self.full_path, "rb") as cache_file, mmap.mmap(cache_file.fileno(), 0, access = mmap.ACCESS_READ) as pixels:
+                    width, height = DECODED_IMAGE_HEADER.unpack_from(pixels)
+                    if len(pixels) == DECODED_IMAGE_HEADER.size + width * height * self.__bytes_per_pixel:
+                        with memoryview(pixels) as view:
+                            mapped_surface = pygame.image.frombuffer(view[DECODED_IMAGE_HEADER.size:], (width, height), self.__pixel_format)
+                            # copy pixels out of the mapped file (display format if possible) before unmapping it
+                            surface = mapped_surface.convert() if pygame.display.get_surface() is not None else mapped_surface.copy()
+                            del mapped_surface
+                        return surface
+            except (OSError, ValueError, struct.error) as e:
+                self._log.warning(f"Error loading decoded image cache ({self.full_path}): {e}")
+            if retry == 0:
+                # corrupted / truncated file: decode again
+                self._purge()
+                self._refresh()
+        raise DecodedImageCacheError(f"Error loading decoded image cache ({self.full_path})")
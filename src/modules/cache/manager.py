@@ -0,0 +1,164 @@
+from typing import Any, Dict, Optional
+from pathlib import Path
+import os
+import threading
+import time
+import weakref
+from ...utils.logger import Logger
+from .scheduler import CacheRefreshScheduler
+from .memory import MemoryCacheTier
+
+DEFAULT_GC_INTERVAL = 600 # 10 min
+TMP_FILE_MAX_AGE = 3600 # leftover (interrupted) atomic write temp files are removed after 1 hour
+
+class CacheManager:
+    """
+    Cache directory manager.
+
+    Tracks the total size of every cache namespace (cache_path sub-directory like "images" or "feeds"),
+    and enforces a per-namespace quota in a background garbage collection pass, evicting the
+    least-recently-used files first (files of live cache instances are never evicted).
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Singleton: ensures a unique instance of CacheManager.
+        """
+        if cls._instance is None:
+            cls._instance = super(CacheManager, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, base_path: Optional[str] = None, quotas: Optional[Dict[str, int]] = None, gc_interval: int = DEFAULT_GC_INTERVAL) -> None:
+        """
+        Initialize the cache manager (only the first call configures the singleton).
+
+        :param base_path: The cache base directory (if None, garbage collection is disabled).
+        :param quotas: Max size (in bytes) by namespace (namespaces without quota are never evicted).
+        :param gc_interval: Time (in seconds) between garbage collection passes.
+        """
+        if hasattr(self, "_initialized"):
+            return
+        self._initialized = True
+        self.__log = Logger()
+        self.__base_path = os.path.normpath(Path(base_path)) if base_path is not None else None
+        self.__quotas = quotas or {}
+        self.__lock = threading.Lock()
+        self.__last_access: Dict[str, float] = {}
+        self.__caches = weakref.WeakKeyDictionary() # live cache instance => cache file path
+        self.__usage: Dict[str, Dict[str, int]] = {}
+        self.__evictions: Dict[str, Dict[str, int]] = {}
+        if self.__base_path is not None:
+            self.collect()
+            self._stop_event = threading.Event()
+            CacheRefreshScheduler().register(self, gc_interval)
+
+    @property
+    def full_path(self) -> Optional[str]:
+        """Get the cache base directory."""
+        return self.__base_path
+
+    def register(self, cache: Any, path: str) -> None:
+        """
+        Register a live cache instance (its files are protected from eviction while it is alive).
+
+        :param cache: The cache instance.
+        :param path: The cache file path.
+        """
+        with self.__lock:
+            self.__caches[cache] = os.path.normpath(path)
+
+    def record_access(self, path: str) -> None:
+        """
+        Record an access to a cache file (LRU order).
+
+        :param path: The cache file path.
+        """
+        self.__last_access[os.path.normpath(path)] = time.time()
+
+    def __namespace(self, path: str) -> str:
+        return os.path.relpath(path, self.__base_path).split(os.sep)[0]
+
+    def usage(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get the usage stats (from the last garbage collection pass) by namespace.
+
+        :return: A dictionary (namespace => files, bytes, quota, evicted_files, evicted_bytes).
+        """
+        with self.__lock:
+            return {
+                namespace: {
+                    **usage,
+                    "quota": self.__quotas.get(namespace, 0),
+                    "evicted_files": self.__evictions.get(namespace, {}).get("files", 0),
+                    "evicted_bytes": self.__evictions.get(namespace, {}).get("bytes", 0)
+                }
+                for namespace, usage in self.__usage.items()
+            }
+
+    def scheduled_refresh(self) -> None:
+        """Garbage collection pass (called from the CacheRefreshScheduler worker threads)."""
+        self.collect()
+
+    def collect(self) -> None:
+        """Scan the cache directory, update the usage stats and evict least-recently-used files of namespaces over quota."""
+        if self.__base_path is None or not os.path.exists(self.__base_path):
+            return
+        now = time.time()
+        with self.__lock:
+            # (registered from other threads: snapshot under lock)
+            in_use = set(list(self.__caches.values()))
+        files: Dict[str, list] = {}
+        for root, _, filenames in os.walk(self.__base_path):
+            for filename in filenames:
+                path = os.path.normpath(os.path.join(root, filename))
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if filename.endswith(".tmp"):
+                    if now - stat.st_mtime > TMP_FILE_MAX_AGE:
+                        self.__remove(path)
+                    continue
+                if filename.endswith(".validators"):
+                    continue # sidecar files are accounted (and removed) with their payload
+                size = stat.st_size
+                validators_path = f"{path}.validators"
+                if os.path.exists(validators_path):
+                    size += os.path.getsize(validators_path)
+                last_access = max(stat.st_mtime, self.__last_access.get(path, 0))
+                files.setdefault(self.__namespace(path), []).append((last_access, path, size))
+        usage = {}
+        for namespace, entries in files.items():
+            total = sum(size for _, _, size in entries)
+            quota = self.__quotas.get(namespace, 0)
+            if quota > 0 and total > quota:
+                for _, path, size in sorted(entries):
+                    if total <= quota:
+                        break
+                    if path in in_use:
+                        continue
+                    if self.__remove(path):
+                        self.__remove(f"{path}.validators")
+                        MemoryCacheTier.remove(path) # (memory tier keys are cache file paths)
+                        self.__last_access.pop(path, None)
+                        total -= size
+                        with self.__lock:
+                            evictions = self.__evictions.setdefault(namespace, { "files": 0, "bytes": 0 })
+                            evictions["files"] += 1
+                            evictions["bytes"] += size
+                        self.__log.info(f"Cache file ({path}) evicted (namespace {namespace} over quota).")
+                entries = [ entry for entry in entries if os.path.exists(entry[1]) ]
+            usage[namespace] = { "files": len(entries), "bytes": total }
+        with self.__lock:
+            self.__usage = usage
+
+    def __remove(self, path: str) -> bool:
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+            return True
+        except OSError as e:
+            self.__log.warning(f"Error removing cache file ({path}): {e}")
+            return False
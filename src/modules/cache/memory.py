@@ -0,0 +1,102 @@
+from typing import Any, Optional, Tuple
+from collections import OrderedDict
+import threading
+
+DEFAULT_MAX_SIZE = 8 * 1024 * 1024 # 8 MB (serialized payload size)
+
+class MemoryCacheTier:
+    """
+    A class to manage the (process-wide) in-memory tier in front of the on-disk ModuleCache files using static methods.
+
+    Entries are keyed by cache file path and evicted in least-recently-used order when the total
+    (serialized) payload size exceeds the configured limit (a 0 limit disables the memory tier).
+    """
+
+    __entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict() # path => (data, size)
+    __size = 0
+    __max_size = DEFAULT_MAX_SIZE
+    __lock = threading.Lock()
+
+    @staticmethod
+    def get(path: str) -> Tuple[bool, Optional[Any]]:
+        """
+        Retrieves the cached data of a path.
+
+        Args:
+            path (str): The cache file path.
+
+        Returns:
+            Tuple[bool, Any]: (True, data) on a hit, (False, None) on a miss.
+        """
+        with MemoryCacheTier.__lock:
+            entry = MemoryCacheTier.__entries.get(path, None)
+            if entry is None:
+                return False, None
+            MemoryCacheTier.__entries.move_to_end(path)
+            return True, entry[0]
+
+    @staticmethod
+    def put(path: str, data: Any, size: int) -> None:
+        """
+        Stores the data of a path (evicting least-recently-used entries if required).
+
+        Args:
+            path (str): The cache file path.
+            data (Any): The (deserialized) data.
+            size (int): The size (in bytes) of the serialized data.
+        """
+        with MemoryCacheTier.__lock:
+            previous = MemoryCacheTier.__entries.pop(path, None)
+            if previous is not None:
+                MemoryCacheTier.__size -= previous[1]
+            if MemoryCacheTier.__max_size == 0 or size > MemoryCacheTier.__max_size:
+                return
+            MemoryCacheTier.__entries[path] = (data, size)
+            MemoryCacheTier.__size += size
+            while MemoryCacheTier.__size > MemoryCacheTier.__max_size:
+                _, (_, evicted_size) = MemoryCacheTier.__entries.popitem(last = False)
+                MemoryCacheTier.__size -= evicted_size
+
+    @staticmethod
+    def remove(path: str) -> None:
+        """
+        Removes the data of a path.
+
+        Args:
+            path (str): The cache file path.
+        """
+        with MemoryCacheTier.__lock:
+            previous = MemoryCacheTier.__entries.pop(path, None)
+            if previous is not None:
+                MemoryCacheTier.__size -= previous[1]
+
+    @staticmethod
+    def get_size() -> int:
+        """
+        Retrieves the total (serialized) size of the cached data.
+
+        Returns:
+            int: The total size in bytes.
+        """
+        return MemoryCacheTier.__size
+
+    @staticmethod
+    def set_max_size(max_size: float) -> None:
+        """
+        Updates the max total (serialized) size of the cached data.
+
+        Args:
+            max_size (float): The new max size in bytes (fractional sizes, like a 0.5 MB limit, are rounded down to whole bytes),
+                0 disables the memory tier (every read goes to the on-disk cache files).
+
+        Raises:
+            ValueError: If max_size is not a number, or is negative.
+        """
+        if not isinstance(max_size, (int, float)) or max_size < 0:
+            raise ValueError("The memory cache max size must be a positive number (or 0 to disable the memory cache).")
+        max_size = int(max_size)
+        with MemoryCacheTier.__lock:
+            MemoryCacheTier.__max_size = max_size
+            while MemoryCacheTier.__size > MemoryCacheTier.__max_size:
+                _, (_, evicted_size) = MemoryCacheTier.__entries.popitem(last = False)
+                MemoryCacheTier.__size -= evicted_size
@@ -0,0 +1,143 @@
+from typing import Dict, List, Optional, Tuple
+from enum import Enum
+import asyncio
+import threading
+from ...utils.logger import Logger
+from .cache import ModuleCache
+from .rss import RSSCache
+from .remote_image import RemoteImageCache
+from .registry import CacheRegistry
+from .scheduler import CacheRefreshScheduler
+
+DEFAULT_MAX_CONCURRENCY = 4 # max simultaneous remote fetches
+DEFAULT_RETRY_DELAY = 30 # seconds before retrying a failed prefetch (doubled after every failure)
+MAX_RETRY_DELAY = 1800 # seconds
+
+class RemoteCacheKind(Enum):
+    RSS = "rss"
+    IMAGE = "image"
+
+    @property
+    def cache_class(self) -> type:
+        return RSSCache if self == RemoteCacheKind.RSS else RemoteImageCache
+
+class RemoteCacheRetry:
+    """A failed prefetch, retried from the CacheRefreshScheduler worker threads with exponential backoff."""
+
+    def __init__(self, prefetcher: "RemoteCachePrefetcher", kind: RemoteCacheKind, url: str, delay: float = DEFAULT_RETRY_DELAY) -> None:
+        self.__log = Logger()
+        self.__prefetcher = prefetcher
+        self.__kind = kind
+        self.__url = url
+        self.__delay = delay
+        self._stop_event = threading.Event()
+        CacheRefreshScheduler().refresh_once(self, delay = self.__delay)
+
+    def scheduled_refresh(self) -> None:
+        if self._stop_event.is_set():
+            return
+        try:
+            cache = CacheRegistry().get(self.__kind.cache_class, self.__prefetcher.base_path, self.__url)
+        except Exception as e:
+            self.__delay = min(self.__delay * 2, MAX_RETRY_DELAY)
+            self.__log.warning(f"Error retrying remote cache prefetch ({self.__url}): {e}, next retry in {self.__delay}s")
+            CacheRefreshScheduler().refresh_once(self, delay = self.__delay)
+            return
+        self.__prefetcher._on_retry_success(self.__kind, self.__url, cache)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+class RemoteCachePrefetcher:
+    def __init__(self, base_path: str, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        """
+        Initialize the prefetcher (warms every remote cache referenced by a skin concurrently, before building widgets).
+
+        Failed prefetches are retried in the background (with exponential backoff), recovered caches are
+        reported by pop_recovered, so widgets showing a placeholder can be rebuilt.
+
+        :param base_path: The base directory where cache files are stored.
+        :param max_concurrency: Max number of simultaneous remote fetches.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"Invalid max_concurrency value: {max_concurrency}")
+        self.__log = Logger()
+        self.__base_path = base_path
+        self.__max_concurrency = max_concurrency
+        self.__lock = threading.Lock()
+        self.__caches: Dict[Tuple[RemoteCacheKind, str], Optional[ModuleCache]] = {}
+        self.__retries: Dict[Tuple[RemoteCacheKind, str], RemoteCacheRetry] = {}
+        self.__recovered = False
+
+    @property
+    def base_path(self) -> str:
+        return self.__base_path
+
+    async def __create(self, semaphore: asyncio.Semaphore, kind: RemoteCacheKind, url: str) -> Optional[ModuleCache]:
+        async with semaphore:
+            try:
+                # cache constructors block on their download (only if the cache file is missing / expired), shared instances are reused
+                return await asyncio.to_thread(CacheRegistry().get, kind.cache_class, self.__base_path, url)
+            except Exception as e:
+                self.__log.error(f"Error prefetching remote cache ({url}): {e}")
+                return None
+
+    async def __fetch_all(self, rss_urls: List[str], image_urls: List[str]) -> Dict[Tuple[RemoteCacheKind, str], Optional[ModuleCache]]:
+        semaphore = asyncio.Semaphore(self.__max_concurrency)
+        sources = [ (RemoteCacheKind.RSS, url) for url in dict.fromkeys(rss_urls) ] + [ (RemoteCacheKind.IMAGE, url) for url in dict.fromkeys(image_urls) ]
+        caches = await asyncio.gather(*(self.__create(semaphore, kind, url) for kind, url in sources))
+        return dict(zip(sources, caches))
+
+    def fetch(self, rss_urls: List[str], image_urls: List[str]) -> Dict[Tuple[RemoteCacheKind, str], Optional[ModuleCache]]:
+        """
+        Fetch (concurrently) all remote sources, so cold start takes as long as the slowest fetch, not the sum.
+
+        :param rss_urls: The RSS feed urls.
+        :param image_urls: The remote image urls.
+        :return: A dictionary ((kind, url) => warm cache instance, or None if the fetch failed and is being retried).
+        """
+        self.__log.info(f"Prefetching {len(rss_urls) + len(image_urls)} remote sources...")
+        caches = asyncio.run(self.__fetch_all(rss_urls, image_urls))
+        with self.__lock:
+            self.__caches.update(caches)
+            for (kind, url), cache in caches.items():
+                if cache is None and (kind, url) not in self.__retries:
+                    self.__retries[(kind, url)] = RemoteCacheRetry(prefetcher = self, kind = kind, url = url)
+        return caches
+
+    def get(self, kind: RemoteCacheKind, url: str) -> Optional[ModuleCache]:
+        """
+        Get a prefetched cache.
+
+        :param kind: The remote source kind.
+        :param url: The remote source url.
+        :return: The cache instance (None if not prefetched, or if its fetch failed).
+        """
+        with self.__lock:
+            return self.__caches.get((kind, url), None)
+
+    def pop_recovered(self) -> bool:
+        """
+        Check (and reset) if a failed prefetch has been recovered since the last call.
+
+        :return: True if at least one failed prefetch is now available.
+        """
+        with self.__lock:
+            recovered = self.__recovered
+            self.__recovered = False
+            return recovered
+
+    def _on_retry_success(self, kind: RemoteCacheKind, url: str, cache: ModuleCache) -> None:
+        with self.__lock:
+            if self.__retries.pop((kind, url), None) is None:
+                return # (stopped)
+            self.__caches[(kind, url)] = cache
+            self.__recovered = True
+        self.__log.info(f"Remote cache prefetch recovered ({url}).")
+
+    def stop(self) -> None:
+        """Stop retrying failed prefetches."""
+        with self.__lock:
+            for retry in self.__retries.values():
+                retry.stop()
+            self.__retries.clear()
@@ -0,0 +1,89 @@
+from typing import Any, Dict, Optional, Tuple
+import os
+import threading
+import weakref
+from ...utils.logger import Logger
+
+class CacheFlight:
+    """A single in-flight operation shared by every caller waiting on the same key (single-flight)."""
+
+    def __init__(self) -> None:
+        self.__done = threading.Event()
+        self.__result: Any = None
+        self.__error: Optional[BaseException] = None
+
+    def resolve(self, result: Any = None, error: Optional[BaseException] = None) -> None:
+        self.__result = result
+        self.__error = error
+        self.__done.set()
+
+    def wait(self) -> Any:
+        """Wait for the operation to finish, returning its result (or raising its error)."""
+        self.__done.wait()
+        if self.__error is not None:
+            raise self.__error
+        return self.__result
+
+class CacheRegistry:
+    """
+    Remote cache instance registry.
+
+    Deduplicates cache instances by key (cache class, base path, url), so every widget referencing the same
+    remote source shares one instance (one periodic refresh, one fetch & parse). Concurrent requests for a
+    key being created wait for the same construction (initial fetch) instead of starting their own.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Singleton: ensures a unique instance of CacheRegistry.
+        """
+        if cls._instance is None:
+            cls._instance = super(CacheRegistry, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if hasattr(self, "_initialized"):
+            return
+        self._initialized = True
+        self.__log = Logger()
+        self.__lock = threading.Lock()
+        self.__caches = weakref.WeakValueDictionary() # key => live cache instance
+        self.__flights: Dict[Tuple[type, str, str], CacheFlight] = {}
+
+    def get(self, cache_class: type, base_path: str, url: str) -> Any:
+        """
+        Get the shared cache instance of a remote source (created on first use).
+
+        :param cache_class: The cache class (like RSSCache or RemoteImageCache).
+        :param base_path: The base directory where cache files are stored.
+        :param url: The remote source url.
+        :return: The cache instance.
+        :raises Exception: Any cache constructor error (raised to every caller waiting on the same key).
+        """
+        key = (cache_class, os.path.normpath(base_path), url)
+        with self.__lock:
+            cache = self.__caches.get(key, None)
+            if cache is not None:
+                return cache
+            flight = self.__flights.get(key, None)
+            leader = flight is None
+            if leader:
+                flight = self.__flights[key] = CacheFlight()
+        if not leader:
+            self.__log.debug(f"Waiting for in-flight cache creation ({url})")
+            return flight.wait()
+        cache = None
+        try:
+            cache = cache_class(base_path = base_path, url = url)
+            with self.__lock:
+                self.__caches[key] = cache
+            flight.resolve(result = cache)
+            return cache
+        except Exception as e:
+            flight.resolve(error = e)
+            raise
+        finally:
+            with self.__lock:
+                self.__flights.pop(key, None)
@@ -4,35 +4,42 @@ import hashlib
 import requests
 
 from .cache import ModuleCache, CacheError
+from .serializer import BytesCacheSerializer
+from ..http.http_client import HTTPClient
 
 class RemoteImageCacheError(CacheError):
     """Custom exception for RemoteImageCache-related errors."""
     pass
 
-DEFAULT_EXPIRATION_TIME = None # never expires
-DEFAULT_TIMEOUT = 10  # seconds
+DEFAULT_EXPIRATION_TIME = 86400 # 1 day (revalidated with conditional requests)
 
 class RemoteImageCache(ModuleCache):
-    def __init__(self, base_path: str, url: str, timeout: Optional[int] = DEFAULT_TIMEOUT) -> None:
+    def __init__(self, base_path: str, url: str, timeout: Optional[int] = None) -> None:
         super().__init__(base_path=os.path.join(base_path, "images"),
                          filename=f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:64]}.image",
-                         expiration=DEFAULT_EXPIRATION_TIME)
+                         expiration=DEFAULT_EXPIRATION_TIME,
+                         serializer=BytesCacheSerializer())
         if not url.startswith(('http://', 'https://')):
-            raise ValueError(f"Invalid URL format: {self.__url}")
+            raise ValueError(f"Invalid URL format: {url}")
         self.__url = url
-        if timeout <= 0:
-            raise ValueError(f"Timeout must be a positive integer: {self.__timeout}")
-        self.__timeout = timeout
+        if timeout is not None and timeout <= 0:
+            raise ValueError(f"Timeout must be a positive integer: {timeout}")
+        self.__timeout = timeout # (HTTPClient default timeout if None)
         super()._check()
 
     def _refresh(self) -> None:
         try:
-            response = requests.get(self.__url, timeout=self.__timeout)
+            response = HTTPClient().get(self.__url, headers=self.conditional_headers(), timeout=self.__timeout)
             response.raise_for_status()
+            if response.status_code == 304:
+                # not modified: only bump freshness (no rewriting)
+                self.touch()
+                return
             if 'image' not in response.headers['Content-Type']:
                 raise ValueError(f"The URL does not point to a valid image: {self.__url}")
             if not self.save_bytes(response.content):
                 raise RemoteImageCacheError(f"Error saving cache of remote image from {self.__url}")
+            self.save_validators(etag = response.headers.get('ETag', None), last_modified = response.headers.get('Last-Modified', None))
         except requests.exceptions.RequestException as e:
             raise RemoteImageCacheError(f"Error fetching image from URL {self.__url}: {e}")
         except ValueError as e:
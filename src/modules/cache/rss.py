@@ -2,6 +2,7 @@ import os
 import hashlib
 
 from .cache import ModuleCache, CacheError
+from .serializer import JSONCacheSerializer
 from ..rss.rss_feed import RSSFeed
 
 class RSSCacheError(CacheError):
@@ -9,10 +10,11 @@ class RSSCacheError(CacheError):
     pass
 
 DEFAULT_EXPIRATION_TIME=300 # 5 min
+DEFAULT_MAX_AGE=86400 # 1 day (stale feeds are served while revalidating, but dropped after max age)
 
 class RSSCache(ModuleCache):
     def __init__(self, base_path: str, url: str) -> None:
-        super().__init__(base_path=os.path.join(base_path, "feeds"), filename=f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:64]}.rss", expiration=DEFAULT_EXPIRATION_TIME)
+        super().__init__(base_path=os.path.join(base_path, "feeds"), filename=f"{hashlib.sha256(url.encode('utf-8')).hexdigest()[:64]}.rss", expiration=DEFAULT_EXPIRATION_TIME, stale_while_revalidate=True, max_age=DEFAULT_MAX_AGE, serializer=JSONCacheSerializer())
         if not url.startswith(('http://', 'https://')):
             raise ValueError(f"Invalid URL format: {self.__url}")
         self.__url = url
@@ -21,8 +23,13 @@ class RSSCache(ModuleCache):
     def _refresh(self) -> None:
         try:
             rss = RSSFeed(url = self.__url)
-            rss_data = rss.get()
+            rss_data = rss.get(conditional_headers = self.conditional_headers())
+            if rss_data is None:
+                # not modified: only bump freshness (no parsing / rewriting)
+                self.touch()
+                return
             if not self.save(rss_data):
                 raise RSSCacheError(f"Error saving cache of rss from {self.__url}")
+            self.save_validators(etag = rss.etag, last_modified = rss.last_modified)
         except Exception as e:
             raise RSSCacheError(f"Unexpected error while refreshing cache: {e}")
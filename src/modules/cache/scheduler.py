@@ -0,0 +1,106 @@
+from typing import Any, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+import heapq
+import itertools
+import random
+import threading
+import time
+import weakref
+from ...utils.logger import Logger
+
+DEFAULT_MAX_WORKERS = 2 # max concurrent cache refreshes
+DEFAULT_JITTER = 0.1 # random delay (up to 10% of the refresh interval) added to every scheduled refresh
+
+class CacheRefreshScheduler:
+    """
+    Shared refresh scheduler for all ModuleCache instances.
+
+    Keeps a heap of next-due times served by one dispatcher thread and a small worker pool, so
+    thread count stays constant no matter how many caches (feeds, images...) are registered.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Singleton: ensures a unique instance of CacheRefreshScheduler.
+        """
+        if cls._instance is None:
+            cls._instance = super(CacheRefreshScheduler, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS, jitter: float = DEFAULT_JITTER) -> None:
+        """
+        Initialize the scheduler (only the first call configures the singleton).
+
+        :param max_workers: Max number of caches refreshing at the same time.
+        :param jitter: Max random delay, as a fraction of the refresh interval, added to every scheduled refresh.
+        """
+        if hasattr(self, "_initialized"):
+            return
+        self._initialized = True
+        if max_workers < 1:
+            raise ValueError(f"Invalid max_workers value: {max_workers}")
+        self.__log = Logger()
+        self.__jitter = jitter
+        self.__heap: List[Tuple[float, int, Any, Optional[float]]] = [] # (due time, sequence, cache weakref, interval (None for one-shot refreshes))
+        self.__sequence = itertools.count()
+        self.__condition = threading.Condition()
+        self.__executor = ThreadPoolExecutor(max_workers = max_workers, thread_name_prefix = "cache-refresh")
+        self.__thread = threading.Thread(target = self.__dispatch, name = "cache-scheduler", daemon = True)
+        self.__thread.start()
+
+    def __next_due(self, interval: float) -> float:
+        return time.monotonic() + interval + random.uniform(0, interval * self.__jitter)
+
+    def register(self, cache: Any, interval: float) -> None:
+        """
+        Schedule periodic refreshes of a cache (the cache is dropped when its _stop_event is set or it is garbage collected).
+
+        :param cache: The cache instance (must implement _refresh).
+        :param interval: Refresh interval, in seconds.
+        """
+        with self.__condition:
+            heapq.heappush(self.__heap, (self.__next_due(interval), next(self.__sequence), weakref.ref(cache), interval))
+            self.__condition.notify()
+
+    def refresh_once(self, cache: Any, delay: float = 0) -> None:
+        """
+        Schedule a single (background) refresh of a cache as soon as possible (or after a delay).
+
+        :param cache: The cache instance (must implement _refresh).
+        :param delay: Time (in seconds) before the refresh.
+        """
+        with self.__condition:
+            heapq.heappush(self.__heap, (time.monotonic() + delay, next(self.__sequence), weakref.ref(cache), None))
+            self.__condition.notify()
+
+    @staticmethod
+    def __stopped(cache: Any) -> bool:
+        stop_event = getattr(cache, "_stop_event", None)
+        return stop_event is not None and stop_event.is_set()
+
+    def __dispatch(self) -> None:
+        while True:
+            with self.__condition:
+                while not self.__heap or self.__heap[0][0] > time.monotonic():
+                    self.__condition.wait(timeout = None if not self.__heap else self.__heap[0][0] - time.monotonic())
+                _, _, cache_ref, interval = heapq.heappop(self.__heap)
+            cache = cache_ref()
+            if cache is None or (interval is not None and CacheRefreshScheduler.__stopped(cache)):
+                continue
+            self.__executor.submit(self.__refresh, cache_ref, interval)
+
+    def __refresh(self, cache_ref: Any, interval: Optional[float]) -> None:
+        cache = cache_ref()
+        if cache is None:
+            return
+        try:
+            cache.scheduled_refresh()
+        except Exception as e:
+            self.__log.error(f"Error refreshing cache ({cache.full_path}): {e}")
+        if interval is not None and not CacheRefreshScheduler.__stopped(cache):
+            # rescheduled after the refresh ends, so the same cache never refreshes concurrently
+            with self.__condition:
+                heapq.heappush(self.__heap, (self.__next_due(interval), next(self.__sequence), cache_ref, interval))
+                self.__condition.notify()
@@ -0,0 +1,59 @@
+from typing import Any
+from abc import ABC, abstractmethod
+import json
+
+class CacheSerializer(ABC):
+    """Base class for cache payload serializers."""
+
+    @property
+    @abstractmethod
+    def format_id(self) -> int:
+        """Unique format identifier (stored in the cache file header)."""
+        pass
+
+    @property
+    def headerless(self) -> bool:
+        """If True, payloads are stored as-is (without header), so the cache file can be used directly by other consumers."""
+        return False
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        """Serialize data to bytes."""
+        pass
+
+    @abstractmethod
+    def loads(self, data: bytes) -> Any:
+        """Deserialize data from bytes."""
+        pass
+
+class JSONCacheSerializer(CacheSerializer):
+    """Compact JSON serializer (for dict / list payloads like RSS items)."""
+
+    @property
+    def format_id(self) -> int:
+        return 1
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, separators = (",", ":"), ensure_ascii = False).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data.decode("utf-8"))
+
+class BytesCacheSerializer(CacheSerializer):
+    """Raw bytes serializer (for payloads like images, stored without header so they can be loaded directly from the cache file path)."""
+
+    @property
+    def format_id(self) -> int:
+        return 2
+
+    @property
+    def headerless(self) -> bool:
+        return True
+
+    def dumps(self, data: Any) -> bytes:
+        if not isinstance(data, bytes):
+            raise ValueError(f"Expected bytes data, got {type(data)}")
+        return data
+
+    def loads(self, data: bytes) -> Any:
+        return data
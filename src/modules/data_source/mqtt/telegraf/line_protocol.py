@@ -0,0 +1,172 @@
+from typing import Any, Callable, Dict, List, Optional
+
+# Influx line protocol: measurement[,tag=value...] field=value[,field=value...] [timestamp]
+# https://docs.influxdata.com/influxdb/v2/reference/syntax/line-protocol/
+
+BOOLEAN_VALUES = { "t": True, "T": True, "true": True, "True": True, "TRUE": True, "f": False, "F": False, "false": False, "False": False, "FALSE": False }
+
+class LineProtocolError(ValueError):
+    """Custom exception for malformed line protocol data."""
+    pass
+
+class LineProtocolRecord:
+    __slots__ = ("measurement", "tags", "fields", "timestamp")
+
+    def __init__(self, measurement: str, tags: Dict[str, str], fields: Dict[str, Any], timestamp: Optional[float] = None):
+        self.measurement = measurement
+        self.tags = tags
+        self.fields = fields
+        self.timestamp = timestamp # seconds (line protocol timestamps are nanoseconds)
+
+    def __repr__(self) -> str:
+        return f"LineProtocolRecord({self.measurement}, tags={self.tags}, fields={self.fields}, timestamp={self.timestamp})"
+
+class LineProtocolParser:
+    """
+    A class to parse Influx line protocol (Telegraf) payloads using static methods.
+
+    Every line is tokenized (measurement, tags, fields & timestamp) in one pass, so all the fields are available at once.
+    """
+
+    @staticmethod
+    def parse_lines(payload: str, number_type: Callable[[str], Any] = float) -> List[LineProtocolRecord]:
+        """
+        Parse a line protocol payload (Telegraf may batch several lines in one message).
+
+        :param payload: The line protocol payload.
+        :param number_type: The type used for float fields (float by default, Decimal for exact values).
+        :return: The parsed records (empty and comment lines are skipped).
+        :raises LineProtocolError: If a line is malformed.
+        """
+        records = []
+        for line in payload.splitlines():
+            record = LineProtocolParser.parse_line(line, number_type)
+            if record is not None:
+                records.append(record)
+        return records
+
+    @staticmethod
+    def parse_line(line: str, number_type: Callable[[str], Any] = float) -> Optional[LineProtocolRecord]:
+        """
+        Parse a single line protocol line, tokenizing measurement, tags, fields and timestamp in one pass.
+
+        Lines without escapes / quoted strings (the common Telegraf case) are tokenized with (native) str splits.
+
+        :param line: The line protocol line.
+        :param number_type: The type used for float fields (float by default, Decimal for exact values).
+        :return: The parsed record (None for empty and comment lines).
+        :raises LineProtocolError: If the line is malformed.
+        """
+        line = line.strip()
+        if not line or line[0] == "#":
+            return None
+        if "\\" in line or '"' in line:
+            return LineProtocolParser.__parse_escaped_line(line, number_type)
+        sections = line.split(" ")
+        if len(sections) == 2:
+            key, fields_section = sections
+            timestamp_section = None
+        elif len(sections) == 3:
+            key, fields_section, timestamp_section = sections
+        else:
+            raise LineProtocolError(f"Invalid line (expected measurement, fields & timestamp sections): {line}")
+        measurement, *tag_pairs = key.split(",")
+        tags = {}
+        for tag_pair in tag_pairs:
+            tag_key, separator, tag_value = tag_pair.partition("=")
+            if not separator:
+                raise LineProtocolError(f"Invalid tag ({tag_pair}): {line}")
+            tags[tag_key] = tag_value
+        fields = {}
+        for field_pair in fields_section.split(","):
+            field_key, separator, field_value = field_pair.partition("=")
+            if not separator or not field_value:
+                raise LineProtocolError(f"Invalid field ({field_pair}): {line}")
+            fields[field_key] = LineProtocolParser.__parse_field_value(field_value, number_type)
+        return LineProtocolRecord(measurement = LineProtocolParser.__required(measurement, line), tags = tags, fields = fields, timestamp = LineProtocolParser.__parse_timestamp(timestamp_section, line))
+
+    @staticmethod
+    def __required(measurement: str, line: str) -> str:
+        if not measurement:
+            raise LineProtocolError(f"Measurement not set: {line}")
+        return measurement
+
+    @staticmethod
+    def __parse_timestamp(timestamp_section: Optional[str], line: str) -> Optional[float]:
+        if timestamp_section is None:
+            return None
+        try:
+            return int(timestamp_section) / 1e9
+        except ValueError:
+            raise LineProtocolError(f"Invalid timestamp ({timestamp_section}): {line}")
+
+    @staticmethod
+    def __parse_field_value(value: str, number_type: Callable[[str], Any]) -> Any:
+        try:
+            last = value[-1]
+            if last == "i" or last == "u":
+                return int(value[:-1])
+            if value[0] == '"':
+                return value[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+            boolean = BOOLEAN_VALUES.get(value, None)
+            if boolean is not None:
+                return boolean
+            return number_type(value)
+        except Exception:
+            raise LineProtocolError(f"Invalid field value ({value})")
+
+    @staticmethod
+    def __split(text: str, separator: str, quoted: bool = False, maxsplit: int = -1) -> List[str]:
+        """Split on unescaped separators (outside double quoted strings if quoted), keeping escape sequences."""
+        parts = []
+        start = 0
+        in_quotes = False
+        index = 0
+        length = len(text)
+        while index < length:
+            char = text[index]
+            if char == "\\":
+                index += 2
+                continue
+            if quoted and char == '"':
+                in_quotes = not in_quotes
+            elif char == separator and not in_quotes and maxsplit != 0:
+                parts.append(text[start:index])
+                start = index + 1
+                maxsplit -= 1
+            index += 1
+        if in_quotes:
+            raise LineProtocolError(f"Unterminated string: {text}")
+        parts.append(text[start:])
+        return parts
+
+    @staticmethod
+    def __unescape(text: str) -> str:
+        if "\\" not in text:
+            return text
+        return text.replace("\\ ", " ").replace("\\,", ",").replace("\\=", "=")
+
+    @staticmethod
+    def __parse_escaped_line(line: str, number_type: Callable[[str], Any]) -> LineProtocolRecord:
+        sections = [ section for section in LineProtocolParser.__split(line, " ", quoted = True) if section ]
+        if len(sections) == 2:
+            key, fields_section = sections
+            timestamp_section = None
+        elif len(sections) == 3:
+            key, fields_section, timestamp_section = sections
+        else:
+            raise LineProtocolError(f"Invalid line (expected measurement, fields & timestamp sections): {line}")
+        measurement, *tag_pairs = LineProtocolParser.__split(key, ",")
+        tags = {}
+        for tag_pair in tag_pairs:
+            tag_parts = LineProtocolParser.__split(tag_pair, "=", maxsplit = 1)
+            if len(tag_parts) != 2:
+                raise LineProtocolError(f"Invalid tag ({tag_pair}): {line}")
+            tags[LineProtocolParser.__unescape(tag_parts[0])] = LineProtocolParser.__unescape(tag_parts[1])
+        fields = {}
+        for field_pair in LineProtocolParser.__split(fields_section, ",", quoted = True):
+            field_parts = LineProtocolParser.__split(field_pair, "=", quoted = True, maxsplit = 1)
+            if len(field_parts) != 2 or not field_parts[1]:
+                raise LineProtocolError(f"Invalid field ({field_pair}): {line}")
+            fields[LineProtocolParser.__unescape(field_parts[0])] = LineProtocolParser.__parse_field_value(field_parts[1], number_type)
+        return LineProtocolRecord(measurement = LineProtocolParser.__required(LineProtocolParser.__unescape(measurement), line), tags = tags, fields = fields, timestamp = LineProtocolParser.__parse_timestamp(timestamp_section, line))
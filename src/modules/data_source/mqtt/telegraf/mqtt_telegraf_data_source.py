@@ -1,90 +1,78 @@
-from typing import Optional
-import re
-from decimal import Decimal
-from ...mqtt.mqtt_data_source import MQTTDataSource
+from typing import Any, Dict, List, Optional, Union
+from ...queue_data_source import QueueDataSource, DataSourceNumberType
 from ....mqtt.mqtt_client import MQTTClient
-from ....queue.queue import QueueMSG
+from ....queue.queue import Queue, QueuePolicy
+from ....queue.ring_buffer import SampleRingBuffer
+from .line_protocol import LineProtocolRecord
+from .mqtt_telegraf_subscription import MQTTTelegrafSubscription
 
-# TODO: refactor MQTTTelegrafCPULoadDataSource
-class MQTTTelegrafCPUDataSource (MQTTDataSource):
-    def __init__(self, mqtt: MQTTClient, topic: str) -> None:
-        super().__init__(mqtt = mqtt, topic = topic)
+class MQTTTelegrafDataSource (QueueDataSource):
+    def __init__(self, mqtt: MQTTClient, topic: str, field: Union[str, List[str]], tags: Optional[Dict[str, str]] = None, measurement: Optional[str] = None, number_type: DataSourceNumberType = DataSourceNumberType.FLOAT, queue: Optional[Union[Queue, SampleRingBuffer]] = None) -> None:
+        """
+        Initialize the Telegraf (Influx line protocol) series data source.
+
+        Series of the same topic share one subscription (every message is parsed once, and routed to every series).
+        The subscription references series weakly: a garbage collected series is dropped without any finalizer (no lock is
+        ever taken from the garbage collector), and the topic is unsubscribed (by the dispatcher thread) once no series is left.
+
+        :param mqtt: The MQTT client.
+        :param topic: The topic to subscribe to.
+        :param field: The field name (or a list of field names, the first one found is used).
+        :param tags: Only records with these tag values are used (like { "cpu": "cpu-total" }).
+        :param measurement: Only records of this measurement are used (if set).
+        :param number_type: The numeric representation of the series values (float by default, Decimal opt-in).
+        :param queue: The series queue (bounded, with an overflow policy other than BLOCK), or a lock-free ring buffer.
+        """
+        if isinstance(queue, Queue) and queue.policy == QueuePolicy.BLOCK:
+            # samples are enqueued from the MQTT dispatcher thread (shared by every series of the connection), which must never wait
+            raise ValueError(f"Invalid queue policy for an MQTT data source: {queue.policy.value}")
+        super().__init__(queue = queue, number_type = number_type)
+        if not field:
+            raise ValueError("Field not set")
+        self.__fields = [ field ] if isinstance(field, str) else list(field)
+        self.__tags = list((tags or {}).items())
+        self.__measurement = measurement
+        # float fields are converted (once, while parsing) to the series number type
+        self.__subscription = MQTTTelegrafSubscription.get(mqtt = mqtt, topic = topic, number_type = number_type.parse)
+        self.__subscription.add_series(self)
 
-    def _parse(self, topic: str, message: str, timestamp: Optional[float] = None):
-        #self._log.debug(message)
-        if re.search(r"usage_idle=", message):
-            #usage_user = self._extract_decimal(pattern = r"usage_user=([0-9]+(?:\.[0-9]+)?)", message = message)
-            #usage_system = self._extract_decimal(pattern = r"usage_system=([0-9]+(?:\.[0-9]+)?)", message = message)
-            usage_idle = self._extract_big_decimal(pattern = r"usage_idle=([0-9]+(?:\.[0-9]+)?)", message = message)
-            #usage_active = self._extract_decimal(pattern = r"usage_active=([0-9]+(?:\.[0-9]+)?)", message = message)
-            #usage_nice = self._extract_decimal(pattern = r"usage_nice=([0-9]+(?:\.[0-9]+)?)", message = message)
-            #usage_iowait = self._extract_decimal(pattern = r"usage_iowait=([0-9]+(?:\.[0-9]+)?)", message = message)
-            #usage_irq = self._extract_decimal(pattern = r"usage_irq=([0-9]+(?:\.[0-9]+)?)", message = message)
-            #usage_softirq = self._extract_decimal(pattern = r"usage_softirq=([0-9]+(?:\.[0-9]+)?)", message = message)
-            #usage_steal = self._extract_decimal(pattern = r"usage_steal=([0-9]+(?:\.[0-9]+)?)", message = message)
-            #usage_guest = self._extract_decimal(pattern = r"usage_guest=([0-9]+(?:\.[0-9]+)?)", message = message)
-            #usage_guest_nice = self._extract_decimal(pattern = r"usage_guest_nice=([0-9]+(?:\.[0-9]+)?)", message = message)
-            if usage_idle is not None:
-                if usage_idle <= 100.0:
-                    self._enqueue(QueueMSG(value = Decimal(100.0) - usage_idle, timestamp = timestamp))
-                else:
-                    self._enqueue(QueueMSG(value = 0.0, timestamp = timestamp))
+    def _on_record(self, record: LineProtocolRecord):
+        if self.__measurement is not None and record.measurement != self.__measurement:
+            return
+        for tag, value in self.__tags:
+            if record.tags.get(tag, None) != value:
+                return
+        for field in self.__fields:
+            value = record.fields.get(field, None)
+            if value is not None:
+                self._enqueue_sample(self._transform(value), record.timestamp)
+                return
 
-class MQTTTelegrafCPUTemperatureDataSource (MQTTDataSource):
-    def __init__(self, mqtt: MQTTClient, topic: str, feature_search: str = "feature=package_id_0") -> None:
-        super().__init__(mqtt = mqtt, topic = topic)
-        self.__feature_search = feature_search
+    def _transform(self, value: Any) -> Any:
+        return value
+
+# TODO: refactor MQTTTelegrafCPULoadDataSource
+class MQTTTelegrafCPUDataSource (MQTTTelegrafDataSource):
+    def __init__(self, mqtt: MQTTClient, topic: str, tags: Optional[Dict[str, str]] = None, number_type: DataSourceNumberType = DataSourceNumberType.FLOAT, queue: Optional[Union[Queue, SampleRingBuffer]] = None) -> None:
+        super().__init__(mqtt = mqtt, topic = topic, field = "usage_idle", tags = tags, number_type = number_type, queue = queue)
+        # constants in the series number type (no mixed type arithmetic per sample)
+        self.__max_usage = number_type.parse("100")
+        self.__min_usage = number_type.parse("0")
 
-    def _parse(self, topic: str, message: str, timestamp: Optional[float] = None):
-        temp = None
-        if re.search(r"{}".format(re.escape(self.__feature_search)), message):
-            temp = self._extract_decimal(pattern = r"temp_input=([0-9]+(?:\.[0-9]+)?)", message = message)
-            if temp is None:
-                temp = self._extract_decimal(pattern = r"temp=([0-9]+(?:\.[0-9]+)?)", message = message)
-        if temp is not None:
-            self._enqueue(QueueMSG(value = temp, timestamp = timestamp))
+    def _transform(self, value: Any) -> Any:
+        if value <= self.__max_usage:
+            return self.__max_usage - value
+        else:
+            return self.__min_usage
 
-class MQTTTelegrafMemoryDataSource (MQTTDataSource):
-    def __init__(self, mqtt: MQTTClient, topic: str) -> None:
-        super().__init__(mqtt = mqtt, topic = topic)
+class MQTTTelegrafCPUTemperatureDataSource (MQTTTelegrafDataSource):
+    def __init__(self, mqtt: MQTTClient, topic: str, feature_search: str = "feature=package_id_0", number_type: DataSourceNumberType = DataSourceNumberType.FLOAT, queue: Optional[Union[Queue, SampleRingBuffer]] = None) -> None:
+        # feature_search is a tag filter (tag=value)
+        tag, separator, value = feature_search.partition("=")
+        if not separator:
+            raise ValueError(f"Invalid feature search (expected tag=value): {feature_search}")
+        super().__init__(mqtt = mqtt, topic = topic, field = [ "temp_input", "temp" ], tags = { tag: value }, number_type = number_type, queue = queue)
 
-    def _parse(self, topic: str, message: str, timestamp: Optional[float] = None):
-        #self._log.debug(message)
-        #active = self._extract_integer(pattern = r"active=([0-9]+)", message = message)
-        #available = self._extract_integer(pattern = r"available=([0-9]+)", message = message)
-        #available_percent = self._extract_decimal(pattern = r"available_percent=([0-9]+(?:\.[0-9]+)?)", message = message)
-        #buffered = self._extract_integer(pattern = r"buffered=([0-9]+)", message = message)
-        #cached = self._extract_integer(pattern = r"cached=([0-9]+)", message = message)
-        #commit_limit = self._extract_integer(pattern = r"commit_limit=([0-9]+)", message = message)
-        #committed_as = self._extract_integer(pattern = r"committed_as=([0-9]+)", message = message)
-        #dirty = self._extract_integer(pattern = r"dirty=([0-9]+)", message = message)
-        #free = self._extract_integer(pattern = r"free=([0-9]+)", message = message)
-        #high_free = self._extract_integer(pattern = r"high_free=([0-9]+)", message = message)
-        #high_total = self._extract_integer(pattern = r"high_total=([0-9]+)", message = message)
-        #huge_pages_free = self._extract_integer(pattern = r"huge_pages_free=([0-9]+)", message = message)
-        #huge_page_size = self._extract_integer(pattern = r"huge_page_size=([0-9]+)", message = message)
-        #huge_pages_total = self._extract_integer(pattern = r"huge_pages_total=([0-9]+)", message = message)
-        #inactive = self._extract_integer(pattern = r"inactive=([0-9]+)", message = message)
-        #laundry = self._extract_integer(pattern = r"laundry=([0-9]+)", message = message)
-        #low_free = self._extract_integer(pattern = r"low_free=([0-9]+)", message = message)
-        #low_total = self._extract_integer(pattern = r"low_total=([0-9]+)", message = message)
-        #mapped = self._extract_integer(pattern = r"mapped=([0-9]+)", message = message)
-        #page_tables = self._extract_integer(pattern = r"page_tables=([0-9]+)", message = message)
-        #shared = self._extract_integer(pattern = r"shared=([0-9]+)", message = message)
-        #slab = self._extract_integer(pattern = r"slab=([0-9]+)", message = message)
-        #sreclaimable = self._extract_integer(pattern = r"sreclaimable=([0-9]+)", message = message)
-        #sunreclaim = self._extract_integer(pattern = r"sunreclaim=([0-9]+)", message = message)
-        #swap_cached = self._extract_integer(pattern = r"swap_cached=([0-9]+)", message = message)
-        #swap_free = self._extract_integer(pattern = r"swap_free=([0-9]+)", message = message)
-        #swap_total = self._extract_integer(pattern = r"swap_total=([0-9]+)", message = message)
-        #total = self._extract_integer(pattern = r"total=([0-9]+)", message = message)
-        #used = self._extract_integer(pattern = r"used=([0-9]+)", message = message)
-        used_percent = self._extract_decimal(pattern = r"used_percent=([0-9]+(?:\.[0-9]+)?)", message = message)
-        #vmalloc_chunk = self._extract_integer(pattern = r"vmalloc_chunk=([0-9]+)", message = message)
-        #vmalloc_total = self._extract_integer(pattern = r"vmalloc_total=([0-9]+)", message = message)
-        #vmalloc_used = self._extract_integer(pattern = r"vmalloc_used=([0-9]+)", message = message)
-        #wired = self._extract_integer(pattern = r"wired=([0-9]+)", message = message)
-        #write_back = self._extract_integer(pattern = r"write_back=([0-9]+)", message = message)
-        #write_back_tmp = self._extract_integer(pattern = r"write_back_tmp=([0-9]+)", message = message)
-        if used_percent is not None:
-            self._enqueue(QueueMSG(value = used_percent, timestamp = timestamp))
+class MQTTTelegrafMemoryDataSource (MQTTTelegrafDataSource):
+    def __init__(self, mqtt: MQTTClient, topic: str, number_type: DataSourceNumberType = DataSourceNumberType.FLOAT, queue: Optional[Union[Queue, SampleRingBuffer]] = None) -> None:
+        super().__init__(mqtt = mqtt, topic = topic, field = "used_percent", number_type = number_type, queue = queue)
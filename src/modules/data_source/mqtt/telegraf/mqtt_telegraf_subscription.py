@@ -0,0 +1,114 @@
+from typing import Any, Callable, Dict, List, Tuple
+import threading
+import weakref
+from ....mqtt.mqtt_client import MQTTClient
+from .....utils.logger import Logger
+from .line_protocol import LineProtocolParser, LineProtocolError
+
+class MQTTTelegrafSubscription:
+    """
+    A shared Telegraf (Influx line protocol) topic subscription.
+
+    Every batch of messages is parsed once, and its records are routed to every series (MQTTTelegrafDataSource)
+    of the topic, so the parse cost is per message (not per widget).
+    Series are referenced weakly (no finalizer), the topic is unsubscribed on the first message received after the
+    last series is garbage collected (or when the last series is explicitly removed).
+    """
+
+    __subscriptions: Dict[Tuple[int, str, Any], "MQTTTelegrafSubscription"] = {}
+    __lock = threading.Lock()
+
+    @staticmethod
+    def get(mqtt: MQTTClient, topic: str, number_type: Callable[[str], Any] = float) -> "MQTTTelegrafSubscription":
+        """
+        Get the shared subscription of a topic (created on first use).
+
+        :param mqtt: The MQTT client.
+        :param topic: The topic to subscribe to.
+        :param number_type: The type used for float fields (float by default, Decimal for exact values).
+        :return: The subscription.
+        """
+        key = (id(mqtt), topic, number_type)
+        with MQTTTelegrafSubscription.__lock:
+            subscription = MQTTTelegrafSubscription.__subscriptions.get(key, None)
+            if subscription is None:
+                subscription = MQTTTelegrafSubscription(mqtt = mqtt, topic = topic, number_type = number_type)
+                MQTTTelegrafSubscription.__subscriptions[key] = subscription
+            return subscription
+
+    @staticmethod
+    def discard(mqtt: MQTTClient) -> None:
+        """
+        Drop every subscription of a (stopped) MQTT client, so its series & the client itself can be garbage collected.
+
+        :param mqtt: The MQTT client.
+        """
+        with MQTTTelegrafSubscription.__lock:
+            for key in [ key for key, subscription in MQTTTelegrafSubscription.__subscriptions.items() if subscription.__mqtt is mqtt ]:
+                subscription = MQTTTelegrafSubscription.__subscriptions.pop(key)
+                subscription.__subscribed = False
+                subscription.__series.clear()
+
+    def __init__(self, mqtt: MQTTClient, topic: str, number_type: Callable[[str], Any] = float) -> None:
+        self.__log = Logger()
+        self.__key = (id(mqtt), topic, number_type)
+        self.__mqtt = mqtt
+        self.__topic = topic
+        self.__number_type = number_type
+        self.__series = weakref.WeakSet()
+        self.__subscribed = False
+
+    def add_series(self, series: Any) -> None:
+        """
+        Route the records of this topic to a series.
+
+        :param series: The series (any object with an _on_record(record) method).
+        """
+        with MQTTTelegrafSubscription.__lock:
+            self.__series.add(series)
+            subscribe = not self.__subscribed
+            self.__subscribed = True
+        if subscribe:
+            self.__mqtt.add_callback(topic = self.__topic, callback = self.__on_messages_received, batch = True)
+
+    def remove_series(self, series: Any) -> None:
+        """
+        Stop routing the records of this topic to a series.
+
+        :param series: The series.
+        """
+        with MQTTTelegrafSubscription.__lock:
+            self.__series.discard(series)
+        self.__unsubscribe_if_unused()
+
+    def __unsubscribe_if_unused(self) -> None:
+        with MQTTTelegrafSubscription.__lock:
+            if len(self.__series) > 0 or not self.__subscribed:
+                return
+            self.__subscribed = False
+            if MQTTTelegrafSubscription.__subscriptions.get(self.__key, None) is self:
+                del MQTTTelegrafSubscription.__subscriptions[self.__key]
+        self.__mqtt.remove_callback(topic = self.__topic, callback = self.__on_messages_received)
+
+    def __on_messages_received(self, topic: str, messages: List[str]) -> None:
+        series = list(self.__series)
+        if len(series) == 0:
+            self.__unsubscribe_if_unused()
+            return
+        try:
+            # whole batch at once (line protocol messages are newline separated lines)
+            records = LineProtocolParser.parse_lines("\n".join(messages), self.__number_type)
+        except LineProtocolError:
+            # keep the records of the valid messages
+            records = []
+            for message in messages:
+                try:
+                    records.extend(LineProtocolParser.parse_lines(message, self.__number_type))
+                except LineProtocolError as e:
+                    self.__log.warning(f"Invalid line protocol message on topic {topic}: {e}")
+        for record in records:
+            for target in series:
+                try:
+                    target._on_record(record)
+                except Exception as e:
+                    self.__log.error(f"Error routing record of topic {topic}: {e}")
@@ -1,13 +1,95 @@
+from typing import Optional, Any, Union, Callable
+from enum import Enum
+from decimal import Decimal
+import time
 from ...utils.logger import Logger
 from ..queue.queue import Queue, QueueMSG
+from ..queue.ring_buffer import SampleRingBuffer, SampleBuffer
+from ..timeseries.time_series import TimeSeries
+
+class DataSourceNumberType(Enum):
+    FLOAT = "float" # float64 (default, fast path)
+    DECIMAL = "decimal" # exact decimal values (opt-in, an order of magnitude slower)
+
+    @staticmethod
+    def from_string(value: str) -> "DataSourceNumberType":
+        try:
+            return DataSourceNumberType(value.lower())
+        except ValueError:
+            raise ValueError(f"Invalid data source number type: {value}")
+
+    @property
+    def parse(self) -> Callable[[Any], Any]:
+        """The conversion (from text / numbers) to this type, applied once at ingestion."""
+        return Decimal if self == DataSourceNumberType.DECIMAL else float
 
 class QueueDataSource:
-    def __init__(self) -> None:
+    def __init__(self, queue: Optional[Union[Queue, SampleRingBuffer]] = None, number_type: DataSourceNumberType = DataSourceNumberType.FLOAT) -> None:
+        """
+        Initialize the data source.
+
+        :param queue: The data source queue (bounded Queue by default, or a lock-free SampleRingBuffer for float samples).
+        :param number_type: The numeric representation of the series values (converted once at ingestion).
+        """
         self._log = Logger()
-        self.__queue = Queue()
+        self.__queue = queue if queue is not None else Queue()
+        self.__ring_buffer = self.__queue if isinstance(self.__queue, SampleRingBuffer) else None
+        if self.__ring_buffer is not None and number_type != DataSourceNumberType.FLOAT:
+            raise ValueError(f"Ring buffer queues only support float values (number type: {number_type.value})")
+        self.__number_type = number_type
+        self.__series: Optional[TimeSeries] = None
+
+    @property
+    def queue(self) -> Union[Queue, SampleRingBuffer]:
+        return self.__queue
+
+    @property
+    def number_type(self) -> DataSourceNumberType:
+        return self.__number_type
+
+    @property
+    def series(self) -> Optional[TimeSeries]:
+        return self.__series
+
+    def attach_series(self, series: Optional[TimeSeries]) -> None:
+        """
+        Feed a (history) time series with every sample of this data source.
+
+        Queue samples are added at ingestion (even if the consumer is blocked), ring buffer samples are added by batch
+        when the ring is drained (consumer side), so the lock-free producer path never takes the series lock.
+
+        :param series: The time series (None to detach).
+        """
+        self.__series = series
 
     def _enqueue(self, msg: QueueMSG) -> None:
+        if self.__series is not None:
+            self.__series.add(msg.timestamp, msg.value)
         self.__queue.enqueue(msg)
 
+    def _enqueue_sample(self, value: Any, timestamp: Optional[float] = None) -> None:
+        """Enqueue a sample (without QueueMSG allocation nor lock on the ring buffer fast path)."""
+        if self.__ring_buffer is not None:
+            self.__ring_buffer.push(timestamp if timestamp is not None else time.time(), value)
+        else:
+            if self.__series is not None:
+                self.__series.add(timestamp, value)
+            self.__queue.enqueue(QueueMSG(value = value, timestamp = timestamp))
+
     def dequeue(self) -> QueueMSG:
-        return self.__queue.dequeue()
+        msg = self.__queue.dequeue()
+        if msg is not None and self.__ring_buffer is not None and self.__series is not None:
+            self.__series.add(msg.timestamp, msg.value)
+        return msg
+
+    def drain_into(self, buffer: SampleBuffer, max_samples: Optional[int] = None) -> int:
+        """
+        Move every pending sample (up to max_samples) to a buffer.
+
+        :return: Number of samples moved.
+        """
+        start = len(buffer)
+        count = self.__queue.drain_into(buffer, max_samples)
+        if count > 0 and self.__ring_buffer is not None and self.__series is not None:
+            self.__series.add_samples(buffer.timestamps[start:], buffer.values[start:])
+        return count
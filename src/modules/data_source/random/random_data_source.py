@@ -1,13 +1,15 @@
+from typing import Optional, Union
 import threading
 import math
 import random
 import time
 from ..queue_data_source import QueueDataSource
-from ...queue.queue import QueueMSG
+from ...queue.queue import Queue, QueueMSG
+from ...queue.ring_buffer import SampleRingBuffer
 
 class RandomDataSource (QueueDataSource):
-    def __init__(self, interval: float = 1) -> None:
-        super().__init__()
+    def __init__(self, interval: float = 1, queue: Optional[Union[Queue, SampleRingBuffer]] = None) -> None:
+        super().__init__(queue = queue)
         self._running = True
         self._thread = None
         self.current_time = 0.0
@@ -0,0 +1,75 @@
+from typing import Optional, Dict, Any
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from ...utils.logger import Logger
+
+# Default user-agent string to be used in the HTTP request headers.
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:112.0) Gecko/20100101 Firefox/112.0'
+DEFAULT_TIMEOUT = 10 # seconds
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5 # seconds (0.5, 1, 2...)
+DEFAULT_MAX_CONCURRENCY = 4 # max simultaneous requests
+DEFAULT_POOL_MAXSIZE = 4 # max keep-alive connections per host
+
+class HTTPClient:
+    """
+    Shared HTTP client (RSS feeds, remote images, weather...).
+
+    Keeps warm keep-alive connections pooled per host, retries failed requests with backoff and
+    caps the number of simultaneous requests.
+    """
+
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        """
+        Singleton: ensures a unique instance of HTTPClient.
+        """
+        if cls._instance is None:
+            cls._instance = super(HTTPClient, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, timeout: int = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES, backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY, pool_maxsize: int = DEFAULT_POOL_MAXSIZE) -> None:
+        """
+        Initializes the HTTP client (only the first call configures the singleton).
+
+        :param timeout: Default timeout for requests in seconds.
+        :param retries: Max retries for failed requests (connection errors & 429/5xx responses).
+        :param backoff_factor: Backoff factor (seconds) between retries.
+        :param max_concurrency: Max number of simultaneous requests.
+        :param pool_maxsize: Max keep-alive connections per host.
+        """
+        if hasattr(self, "_initialized"):
+            return
+        self._initialized = True
+        if timeout <= 0:
+            raise ValueError(f"Timeout must be a positive integer: {timeout}")
+        if max_concurrency < 1:
+            raise ValueError(f"Invalid max_concurrency value: {max_concurrency}")
+        self.__log = Logger()
+        self.__timeout = timeout
+        self.__semaphore = threading.BoundedSemaphore(max_concurrency)
+        retry = Retry(total = retries, backoff_factor = backoff_factor, status_forcelist = (429, 500, 502, 503, 504), allowed_methods = ("GET", "HEAD"))
+        adapter = HTTPAdapter(pool_connections = pool_maxsize, pool_maxsize = pool_maxsize, max_retries = retry)
+        self.__session = requests.Session()
+        self.__session.headers.update({ 'User-Agent': DEFAULT_USER_AGENT })
+        self.__session.mount("http://", adapter)
+        self.__session.mount("https://", adapter)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None, headers: Optional[Dict[str, str]] = None, timeout: Optional[int] = None) -> requests.Response:
+        """
+        Performs a GET request using the pooled session.
+
+        :param url: The URL to fetch.
+        :param params: Optional query string params.
+        :param headers: Optional request headers (merged with the default ones).
+        :param timeout: Optional timeout in seconds (default timeout used if None).
+        :return: The response.
+        :raises requests.exceptions.RequestException: If the request fails (after retries).
+        """
+        with self.__semaphore:
+            self.__log.debug(f"GET {url}")
+            return self.__session.get(url, params = params, headers = headers, timeout = timeout if timeout is not None else self.__timeout)
@@ -1,26 +1,36 @@
-from typing import Optional, Callable, Dict, List
+from typing import Optional, Callable, Dict, List, Tuple, Any
+from collections import deque
 import paho.mqtt.client as mqtt
+import threading
 import time
 from ...utils.logger import Logger
+from .topic_trie import TopicTrie
 
-class MQTTClient:
-    _instance = None
+MAX_RESOLVED_TOPICS = 4096 # max memoized (concrete topic => callbacks) entries
+MAX_PENDING_MESSAGES = 8192 # max received messages waiting for dispatch (oldest are dropped)
+DEFAULT_BATCH_INTERVAL = 0.05 # seconds
+DEFAULT_CONNECTION_NAME = "default"
 
-    def __new__(cls, *args, **kwargs):
-        """
-        Singleton: ensures a unique instance of MQTTClient.
+class MQTTClient:
+    def __init__(self, broker: str, port: int = 1883, username: Optional[str] = None,
+                 password: Optional[str] = None, batch_interval: float = DEFAULT_BATCH_INTERVAL,
+                 name: str = DEFAULT_CONNECTION_NAME) -> None:
         """
-        if cls._instance is None:
-            cls._instance = super(MQTTClient, cls).__new__(cls)
-        return cls._instance
+        Initialize a (named) MQTT broker connection.
 
-    def __init__(self, broker: str, port: int = 1883, username: Optional[str] = None,
-                 password: Optional[str] = None) -> None:
-        if hasattr(self, "_initialized"):
-            return
-        self._initialized = True
+        Every connection has its own paho network thread and dispatcher thread, so a busy broker
+        never delays the messages of another one. Received messages are only buffered on the
+        paho network thread, the dispatcher thread decodes them and runs the callbacks by batch (grouped by topic).
 
+        :param broker: The broker host.
+        :param port: The broker port.
+        :param username: The username (optional).
+        :param password: The password (optional).
+        :param batch_interval: Time (in seconds) the dispatcher waits to batch a burst of messages (0: no wait).
+        :param name: The connection name (referenced by the data sources).
+        """
         self.__log = Logger()
+        self.__name = name
         self.__client = mqtt.Client()
 
         # Assign MQTT client event handlers
@@ -31,29 +41,61 @@ class MQTTClient:
         if username:
             self.__client.username_pw_set(username, password)
 
-        self.__callbacks: Dict[str, List[Callable[[str, str], None]]] = {}
+        # (callback, batch) entries by topic filter
+        self.__callbacks: Dict[str, List[Tuple[Callable[[str, Any], None], bool]]] = {}
+        # subscriptions trie, resolved callbacks are memoized by concrete topic (invalidated on subscription changes)
+        self.__subscriptions = TopicTrie()
+        self.__resolved: Dict[str, Tuple[Tuple[Callable[[str, Any], None], bool], ...]] = {}
+        self.__lock = threading.Lock()
+
+        # received (topic, payload) messages, swapped out by the dispatcher thread
+        self.__pending: deque = deque()
+        self.__pending_condition = threading.Condition()
+        self.__dropped = 0
+        self.__batch_interval = batch_interval
+        self.__stopped = False
+        self.__dispatcher = threading.Thread(target = self.__dispatch_loop, name = f"mqtt-dispatcher-{name}", daemon = True)
+        self.__dispatcher.start()
 
         try:
             self.__client.connect(broker, port, 60)
             self.__client.loop_start()
         except Exception as e:
-            self.__log.error(f"Failed to connect to MQTT broker: {e}")
+            self.__log.error(f"Failed to connect to MQTT broker ({name}): {e}")
+            self.__stop_dispatcher()
             raise
 
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    def stop(self) -> None:
+        """
+        Disconnects from the broker and stops the connection threads.
+        """
+        self.__client.disconnect()
+        self.__client.loop_stop()
+        self.__stop_dispatcher()
+
+    def __stop_dispatcher(self) -> None:
+        with self.__pending_condition:
+            self.__stopped = True
+            self.__pending_condition.notify()
+
     def __on_connect(self, client, userdata, flags, rc):
         """
         Handles the MQTT broker connection event.
         """
         if rc == 0:
-            self.__log.info("Connected to the broker.")
+            self.__log.info(f"Connected to the broker ({self.__name}).")
         else:
-            self.__log.warning(f"Error while connecting to broker. Error code: {rc}")
+            self.__log.warning(f"Error while connecting to broker ({self.__name}). Error code: {rc}")
 
     def __on_disconnect(self, client, userdata, rc):
         """
         Handles the MQTT broker disconnection event.
         """
-        self.__log.warning("Broker disconnected.")
+        self.__log.warning(f"Broker disconnected ({self.__name}).")
         if rc != 0:  # Reconnect if the disconnection was not intentional
             self.__log.info("Attempting to reconnect...")
             self.__reconnect()
@@ -65,48 +107,132 @@ class MQTTClient:
         while True:
             try:
                 self.__client.reconnect()
-                self.__log.info("Reconnected successfully.")
+                self.__log.info(f"Reconnected successfully ({self.__name}).")
                 break
             except mqtt.MQTTException as e:
                 self.__log.warning(f"Reconnection attempt failed: {e}")
                 time.sleep(5)
 
+    @property
+    def dropped(self) -> int:
+        """Number of received messages dropped (dispatcher falling behind)."""
+        return self.__dropped
+
     def __on_message(self, client, userdata, msg):
         """
-        Handles incoming messages and triggers registered callbacks for the corresponding topic.
+        Handles incoming messages (paho network thread): only buffers the raw payload for the dispatcher thread.
+        """
+        with self.__pending_condition:
+            if len(self.__pending) >= MAX_PENDING_MESSAGES:
+                self.__pending.popleft()
+                self.__dropped += 1
+            self.__pending.append((msg.topic, msg.payload))
+            if len(self.__pending) == 1:
+                self.__pending_condition.notify()
+
+    def __dispatch_loop(self) -> None:
+        """
+        Dispatcher thread: waits for messages, lets a burst accumulate, then dispatches the whole batch.
+        """
+        dropped = 0
+        while True:
+            with self.__pending_condition:
+                self.__pending_condition.wait_for(lambda: len(self.__pending) > 0 or self.__stopped)
+                if self.__stopped:
+                    return
+            if self.__batch_interval > 0:
+                time.sleep(self.__batch_interval)
+            with self.__pending_condition:
+                batch = self.__pending
+                self.__pending = deque()
+            if self.__dropped != dropped:
+                self.__log.warning(f"{self.__dropped - dropped} MQTT messages dropped ({self.__name}, dispatch too slow).")
+                dropped = self.__dropped
+            self.__dispatch(batch)
+
+    def __dispatch(self, batch: deque) -> None:
+        """
+        Triggers the registered callbacks of a batch of messages: callbacks are resolved (and payloads decoded)
+        once per topic, batch callbacks get every payload of their topic in one call.
+        """
+        payloads_by_topic: Dict[str, List[bytes]] = {}
+        for topic, payload in batch:
+            payloads = payloads_by_topic.get(topic, None)
+            if payloads is None:
+                payloads_by_topic[topic] = [ payload ]
+            else:
+                payloads.append(payload)
+        for topic, raw_payloads in payloads_by_topic.items():
+            callbacks = self.__resolve(topic)
+            if not callbacks:
+                continue
+            payloads = []
+            for raw_payload in raw_payloads:
+                try:
+                    payloads.append(raw_payload.decode())
+                except UnicodeDecodeError as e:
+                    self.__log.warning(f"Invalid message payload on topic {topic}: {e}")
+            if not payloads:
+                continue
+            for callback, batch_callback in callbacks:
+                try:
+                    if batch_callback:
+                        callback(topic, payloads)
+                    else:
+                        for payload in payloads:
+                            callback(topic, payload)
+                except Exception as e:
+                    self.__log.error(f"Error in callback for topic {topic}: {e}")
+
+    def __resolve(self, topic: str) -> Tuple[Tuple[Callable[[str, Any], None], bool], ...]:
+        """
+        Get the callbacks of every subscription matching a topic (memoized).
         """
-        payload = msg.payload.decode()
-        for topic, callbacks in self.__callbacks.items():
-            if mqtt.topic_matches_sub(topic, msg.topic):
-                for callback in callbacks:
-                    try:
-                        callback(msg.topic, payload)
-                    except Exception as e:
-                        self.__log.error(f"Error in callback for topic {msg.topic}: {e}")
+        callbacks = self.__resolved.get(topic, None)
+        if callbacks is None:
+            with self.__lock:
+                callbacks = tuple(callback for topic_filter in self.__subscriptions.match(topic) for callback in self.__callbacks.get(topic_filter, []))
+                if len(self.__resolved) >= MAX_RESOLVED_TOPICS:
+                    self.__resolved.clear()
+                self.__resolved[topic] = callbacks
+        return callbacks
 
-    def add_callback(self, topic: str, callback: Callable[[str, str], None]):
+    def add_callback(self, topic: str, callback: Callable[[str, Any], None], batch: bool = False):
         """
         Registers a callback function for a specific topic.
         :param topic: The topic to subscribe to.
         :param callback: The function to execute when a message is received on the topic.
+        :param batch: If True, the callback is called once per batch, with the list of the received payloads (instead of once per payload).
         """
-        if topic not in self.__callbacks:
-            self.__callbacks[topic] = []
+        with self.__lock:
+            subscribe = topic not in self.__callbacks
+            if subscribe:
+                self.__subscriptions.add(topic)
+                self.__callbacks[topic] = []
+            self.__callbacks[topic].append((callback, batch))
+            self.__resolved.clear()
+        if subscribe:
             self.__log.info(f"Subscribing to topic: {topic}.")
             self.__client.subscribe(topic)
-        self.__callbacks[topic].append(callback)
         self.__log.info(f"Callback registered for topic: {topic}")
 
-    def remove_callback(self, topic: str, callback: Callable[[str, str], None]):
+    def remove_callback(self, topic: str, callback: Callable[[str, Any], None]):
         """
         Removes a specific callback for a topic.
         :param topic: The topic associated with the callback.
         :param callback: The callback function to remove.
         """
-        if topic in self.__callbacks and callback in self.__callbacks[topic]:
-            self.__callbacks[topic].remove(callback)
-            self.__log.info(f"Callback removed for topic: {topic}.")
-            if not self.__callbacks[topic]:
-                self.__client.unsubscribe(topic)
+        with self.__lock:
+            entry = next((entry for entry in self.__callbacks.get(topic, []) if entry[0] == callback), None)
+            if entry is None:
+                return
+            self.__callbacks[topic].remove(entry)
+            unsubscribe = not self.__callbacks[topic]
+            if unsubscribe:
+                self.__subscriptions.remove(topic)
                 del self.__callbacks[topic]
-                self.__log.info(f"Unsubscribed from topic: {topic}.")
+            self.__resolved.clear()
+        self.__log.info(f"Callback removed for topic: {topic}.")
+        if unsubscribe:
+            self.__client.unsubscribe(topic)
+            self.__log.info(f"Unsubscribed from topic: {topic}.")
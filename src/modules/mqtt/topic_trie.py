@@ -0,0 +1,88 @@
+from typing import Dict, List, Optional, Set
+
+SINGLE_LEVEL_WILDCARD = "+"
+MULTI_LEVEL_WILDCARD = "#"
+
+class TopicTrieNode:
+    __slots__ = ("children", "topic_filter")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "TopicTrieNode"] = {}
+        self.topic_filter: Optional[str] = None # set if a subscription (topic filter) ends on this node
+
+class TopicTrie:
+    """
+    Subscription (topic filter) trie, with MQTT "+" (single level) and "#" (multi level) wildcards support.
+
+    Resolves the topic filters matching a topic in O(topic depth), instead of testing every subscription.
+    """
+
+    def __init__(self) -> None:
+        self.__root = TopicTrieNode()
+
+    def add(self, topic_filter: str) -> None:
+        """
+        Add a topic filter.
+
+        :param topic_filter: The topic filter (like "telegraf/+/cpu" or "telegraf/#").
+        :raises ValueError: If the topic filter is invalid.
+        """
+        levels = topic_filter.split("/")
+        for index, level in enumerate(levels):
+            if (MULTI_LEVEL_WILDCARD in level and (level != MULTI_LEVEL_WILDCARD or index != len(levels) - 1)) or (SINGLE_LEVEL_WILDCARD in level and level != SINGLE_LEVEL_WILDCARD):
+                raise ValueError(f"Invalid topic filter: {topic_filter}")
+        node = self.__root
+        for level in levels:
+            node = node.children.setdefault(level, TopicTrieNode())
+        node.topic_filter = topic_filter
+
+    def remove(self, topic_filter: str) -> None:
+        """
+        Remove a topic filter (empty branches are pruned).
+
+        :param topic_filter: The topic filter.
+        """
+        path = [ self.__root ]
+        levels = topic_filter.split("/")
+        for level in levels:
+            node = path[-1].children.get(level, None)
+            if node is None:
+                return
+            path.append(node)
+        path[-1].topic_filter = None
+        for index in range(len(levels), 0, -1):
+            node = path[index]
+            if node.topic_filter is not None or node.children:
+                break
+            del path[index - 1].children[levels[index - 1]]
+
+    def match(self, topic: str) -> Set[str]:
+        """
+        Get the topic filters matching a (concrete) topic.
+
+        :param topic: The topic.
+        :return: The matching topic filters.
+        """
+        matches: Set[str] = set()
+        levels = topic.split("/")
+        # wildcards at the first level do not match topics starting with "$" (like $SYS)
+        self.__match(self.__root, levels, 0, matches, not topic.startswith("$"))
+        return matches
+
+    def __match(self, node: TopicTrieNode, levels: List[str], index: int, matches: Set[str], wildcards: bool = True) -> None:
+        if wildcards:
+            # "#" also matches the parent level ("a/#" matches "a")
+            multi_level = node.children.get(MULTI_LEVEL_WILDCARD, None)
+            if multi_level is not None and multi_level.topic_filter is not None:
+                matches.add(multi_level.topic_filter)
+        if index == len(levels):
+            if node.topic_filter is not None:
+                matches.add(node.topic_filter)
+            return
+        child = node.children.get(levels[index], None)
+        if child is not None:
+            self.__match(child, levels, index + 1, matches)
+        if wildcards:
+            single_level = node.children.get(SINGLE_LEVEL_WILDCARD, None)
+            if single_level is not None:
+                self.__match(single_level, levels, index + 1, matches)
@@ -1,31 +1,154 @@
-from typing import Optional, Any
+from typing import Optional, Any, Dict
+from enum import Enum
+from collections import deque
 from ...utils.logger import Logger
+import threading
 import time
-import queue
+
+DEFAULT_MAX_SIZE = 256
+DEFAULT_BLOCK_TIMEOUT = 1.0 # seconds
 
 class QueueMSG:
-    def __init__(self, value: Any, timestamp: Optional[float] = None):
+    def __init__(self, value: Any, timestamp: Optional[float] = None, samples: int = 1):
         self.value = value
         if timestamp is not None:
             self.timestamp = timestamp
         else:
             self.timestamp = time.time()
+        self.samples = samples # number of (downsampled) samples aggregated in this message
+
+class QueuePolicy(Enum):
+    LATEST = "latest" # keep only the latest message
+    LAST_N = "last_n" # keep the last max_size messages (oldest are dropped)
+    DOWNSAMPLE = "downsample" # on overflow, merge adjacent messages (min / max / avg), keeping the whole time range at a lower resolution
+    BLOCK = "block" # producers wait (up to block_timeout) for free space, then the message is dropped (not allowed for MQTT fed data sources)
+
+    @staticmethod
+    def from_string(value: str) -> "QueuePolicy":
+        try:
+            return QueuePolicy(value.lower())
+        except ValueError:
+            raise ValueError(f"Invalid queue policy: {value}")
+
+class QueueDownsampleMode(Enum):
+    MIN = "min"
+    MAX = "max"
+    AVG = "avg"
+
+    @staticmethod
+    def from_string(value: str) -> "QueueDownsampleMode":
+        try:
+            return QueueDownsampleMode(value.lower())
+        except ValueError:
+            raise ValueError(f"Invalid queue downsample mode: {value}")
 
 class Queue:
-    def __init__(self):
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, policy: QueuePolicy = QueuePolicy.LAST_N, downsample_mode: QueueDownsampleMode = QueueDownsampleMode.AVG, block_timeout: float = DEFAULT_BLOCK_TIMEOUT):
+        """
+        Initialize the (bounded) queue, memory stays flat however long the consumer is blocked.
+
+        :param max_size: Max number of queued messages (1 with the LATEST policy).
+        :param policy: The overflow policy.
+        :param downsample_mode: The aggregation of merged messages (DOWNSAMPLE policy).
+        :param block_timeout: Max time (in seconds) producers wait for free space (BLOCK policy).
+        """
+        if max_size < 1:
+            raise ValueError(f"Invalid queue max size: {max_size}")
+        if policy == QueuePolicy.DOWNSAMPLE and max_size < 2:
+            raise ValueError(f"Invalid queue max size (downsample policy requires at least 2): {max_size}")
         self.__log = Logger()
-        self.__shared_queue = queue.Queue()
+        self.__max_size = 1 if policy == QueuePolicy.LATEST else max_size
+        self.__policy = policy
+        self.__downsample_mode = downsample_mode
+        self.__block_timeout = block_timeout
+        self.__messages = deque()
+        self.__condition = threading.Condition()
+        self.__dropped = 0
+        self.__downsampled = 0
+
+    @property
+    def policy(self) -> QueuePolicy:
+        return self.__policy
+
+    @property
+    def max_size(self) -> int:
+        return self.__max_size
+
+    @property
+    def size(self) -> int:
+        return len(self.__messages)
+
+    @property
+    def dropped(self) -> int:
+        """Number of dropped messages."""
+        return self.__dropped
+
+    @property
+    def downsampled(self) -> int:
+        """Number of messages merged into other messages (DOWNSAMPLE policy)."""
+        return self.__downsampled
+
+    def stats(self) -> Dict[str, Any]:
+        return { "policy": self.__policy.value, "size": self.size, "max_size": self.__max_size, "dropped": self.__dropped, "downsampled": self.__downsampled }
 
     def enqueue(self, msg: QueueMSG):
         #self.__log.debug(f"enqueue message: {msg.value} - timestamp: {msg.timestamp}")
-        self.__shared_queue.put(msg)
+        with self.__condition:
+            if len(self.__messages) >= self.__max_size:
+                if self.__policy == QueuePolicy.BLOCK:
+                    if not self.__condition.wait_for(lambda: len(self.__messages) < self.__max_size, timeout = self.__block_timeout):
+                        self.__dropped += 1
+                        return
+                elif self.__policy == QueuePolicy.DOWNSAMPLE:
+                    self.__downsample()
+                else:
+                    self.__messages.popleft()
+                    self.__dropped += 1
+            self.__messages.append(msg)
 
     def dequeue(self) -> Optional[QueueMSG]:
-        try:
-            msg = self.__shared_queue.get_nowait()
+        with self.__condition:
+            if not self.__messages:
+                return None
+            msg = self.__messages.popleft()
             #self.__log.debug(f"dequeue message: {msg}")
+            if self.__policy == QueuePolicy.BLOCK:
+                self.__condition.notify()
             return msg
-        except queue.Empty:
-            #self.__log.debug("empty queue")
-            #time.sleep(0.2)
-            return None
+
+    def drain_into(self, buffer: Any, max_samples: Optional[int] = None) -> int:
+        """
+        Move every queued message (up to max_samples) to a buffer (any object with an append(timestamp, value) method).
+
+        :return: Number of messages moved.
+        """
+        with self.__condition:
+            count = len(self.__messages) if max_samples is None else min(len(self.__messages), max_samples)
+            for _ in range(count):
+                msg = self.__messages.popleft()
+                buffer.append(msg.timestamp, msg.value)
+            if count > 0 and self.__policy == QueuePolicy.BLOCK:
+                self.__condition.notify_all()
+            return count
+
+    def __downsample(self) -> None:
+        """Merge adjacent messages (halving the queue size), amortized O(1) per message."""
+        merged = deque()
+        while len(self.__messages) > 1:
+            merged.append(self.__merge(self.__messages.popleft(), self.__messages.popleft()))
+            self.__downsampled += 1
+        merged.extend(self.__messages)
+        self.__messages = merged
+
+    def __merge(self, first: QueueMSG, second: QueueMSG) -> QueueMSG:
+        first_value, second_value = first.value, second.value
+        if type(first_value) is not type(second_value):
+            first_value, second_value = float(first_value), float(second_value)
+        if self.__downsample_mode == QueueDownsampleMode.MIN:
+            value = min(first_value, second_value)
+        elif self.__downsample_mode == QueueDownsampleMode.MAX:
+            value = max(first_value, second_value)
+        else:
+            # weighted by the number of samples already aggregated in each message
+            value = (first_value * first.samples + second_value * second.samples) / (first.samples + second.samples)
+        return QueueMSG(value = value, timestamp = second.timestamp, samples = first.samples + second.samples)
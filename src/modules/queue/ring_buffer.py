@@ -0,0 +1,144 @@
+from typing import Optional, Any, Dict, Tuple
+from array import array
+
+from .queue import QueueMSG
+
+DEFAULT_CAPACITY = 1024
+
+class SampleBuffer:
+    """Consumer side (timestamp, value) sample batch, array backed (no object per sample)."""
+
+    __slots__ = ("timestamps", "values")
+
+    def __init__(self) -> None:
+        self.timestamps = array("d")
+        self.values = array("d")
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def append(self, timestamp: float, value: float) -> None:
+        self.timestamps.append(timestamp)
+        self.values.append(value)
+
+    def clear(self) -> None:
+        del self.timestamps[:]
+        del self.values[:]
+
+class SampleRingBuffer:
+    """
+    Lock-free single-producer / single-consumer ring of preallocated (timestamp, value) float slots.
+
+    Only the producer moves the write index, and only the consumer moves the read index (indices are
+    monotonic, slots are addressed with a power of two mask), so no lock / condition is needed.
+    The producer never touches the read index: when the ring is full, the newest sample is dropped (and counted).
+    """
+
+    __slots__ = ("__capacity", "__mask", "__timestamps", "__values", "__read_index", "__write_index", "__dropped")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        """
+        Initialize the ring buffer.
+
+        :param capacity: Number of slots (rounded up to a power of two).
+        """
+        if capacity < 1:
+            raise ValueError(f"Invalid ring buffer capacity: {capacity}")
+        self.__capacity = 1 << (capacity - 1).bit_length()
+        self.__mask = self.__capacity - 1
+        self.__timestamps = array("d", bytes(8 * self.__capacity))
+        self.__values = array("d", bytes(8 * self.__capacity))
+        self.__read_index = 0
+        self.__write_index = 0
+        self.__dropped = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.__capacity
+
+    @property
+    def max_size(self) -> int:
+        return self.__capacity
+
+    @property
+    def size(self) -> int:
+        return self.__write_index - self.__read_index
+
+    @property
+    def dropped(self) -> int:
+        """Number of dropped samples (ring full)."""
+        return self.__dropped
+
+    def stats(self) -> Dict[str, Any]:
+        return { "policy": "ring", "size": self.size, "max_size": self.__capacity, "dropped": self.__dropped, "downsampled": 0 }
+
+    def push(self, timestamp: float, value: float) -> bool:
+        """
+        Producer: append a sample.
+
+        :return: False if the ring is full (the sample is dropped).
+        """
+        write_index = self.__write_index
+        if write_index - self.__read_index >= self.__capacity:
+            self.__dropped += 1
+            return False
+        slot = write_index & self.__mask
+        self.__timestamps[slot] = timestamp
+        self.__values[slot] = value
+        # publish the slot (after writing it)
+        self.__write_index = write_index + 1
+        return True
+
+    def pop(self) -> Optional[Tuple[float, float]]:
+        """
+        Consumer: remove the oldest sample.
+
+        :return: The (timestamp, value) sample, or None if the ring is empty.
+        """
+        read_index = self.__read_index
+        if read_index == self.__write_index:
+            return None
+        slot = read_index & self.__mask
+        sample = (self.__timestamps[slot], self.__values[slot])
+        # release the slot (after reading it)
+        self.__read_index = read_index + 1
+        return sample
+
+    def drain_into(self, buffer: SampleBuffer, max_samples: Optional[int] = None) -> int:
+        """
+        Consumer: move every pending sample (up to max_samples) to a buffer, in (at most two) slice copies.
+
+        :param buffer: The destination buffer.
+        :param max_samples: Max number of samples moved (all if None).
+        :return: Number of samples moved.
+        """
+        read_index = self.__read_index
+        count = self.__write_index - read_index
+        if max_samples is not None:
+            count = min(count, max_samples)
+        if count <= 0:
+            return 0
+        start = read_index & self.__mask
+        end = start + count
+        if end <= self.__capacity:
+            buffer.timestamps.extend(self.__timestamps[start:end])
+            buffer.values.extend(self.__values[start:end])
+        else:
+            end &= self.__mask
+            buffer.timestamps.extend(self.__timestamps[start:])
+            buffer.timestamps.extend(self.__timestamps[:end])
+            buffer.values.extend(self.__values[start:])
+            buffer.values.extend(self.__values[:end])
+        self.__read_index = read_index + count
+        return count
+
+    def enqueue(self, msg: QueueMSG) -> None:
+        """Queue compatible producer method (prefer push, no QueueMSG allocation)."""
+        self.push(msg.timestamp, float(msg.value))
+
+    def dequeue(self) -> Optional[QueueMSG]:
+        """Queue compatible consumer method (prefer drain_into, no QueueMSG allocation)."""
+        sample = self.pop()
+        if sample is None:
+            return None
+        return QueueMSG(value = sample[1], timestamp = sample[0])
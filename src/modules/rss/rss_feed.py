@@ -2,30 +2,44 @@ from typing import Dict, List, Optional
 import requests
 import feedparser
 from ...utils.logger import Logger
+from ..http.http_client import HTTPClient
 
 # Default user-agent string to be used in the HTTP request headers.
 DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:112.0) Gecko/20100101 Firefox/112.0'
 
 class RSSFeed:
-    def __init__(self, url: str, timeout: int = 10) -> None:
+    def __init__(self, url: str, timeout: Optional[int] = None) -> None:
         """
         Initializes the RSSFeed object with the URL of the RSS feed.
 
         :param url: The URL of the RSS feed to be fetched.
-        :param timeout: Timeout duration for the HTTP request in seconds (default is 10 seconds).
+        :param timeout: Timeout duration for the HTTP request in seconds (HTTPClient default timeout if None).
         """
         self.__log = Logger()
         self.__url = url
         self.__timeout = timeout
+        self.__etag = None
+        self.__last_modified = None
 
-    def get(self, url: Optional[str] = None) -> Dict[str, List[Dict[str, str]]]:
+    @property
+    def etag(self) -> Optional[str]:
+        """The ETag response header value of the last request."""
+        return self.__etag
+
+    @property
+    def last_modified(self) -> Optional[str]:
+        """The Last-Modified response header value of the last request."""
+        return self.__last_modified
+
+    def get(self, url: Optional[str] = None, conditional_headers: Optional[Dict[str, str]] = None) -> Optional[Dict[str, List[Dict[str, str]]]]:
         """
         Fetches the RSS feed, parses it, and returns a simplified dictionary containing
         the feed title and a list of parsed feed entries.
 
         :param url: The URL of the RSS feed to fetch. If None, the URL provided at initialization is used.
+        :param conditional_headers: Optional revalidation headers (If-None-Match / If-Modified-Since).
         :return: A dictionary containing the feed title and a list of feed items (each with link, title,
-                 published date, and author).
+                 published date, and author), or None if the feed was not modified (HTTP 304).
         :raises RuntimeError: If there is an error in fetching or parsing the feed.
         :raises ValueError: If the feed does not contain valid entries.
         """
@@ -37,12 +51,22 @@ class RSSFeed:
         headers = {
             'User-Agent': DEFAULT_USER_AGENT
         }
+        if conditional_headers:
+            headers.update(conditional_headers)
 
         try:
-            # Make the HTTP request to fetch the feed
-            response = requests.get(feed_url, headers=headers, timeout=self.__timeout)
+            # Make the HTTP request (shared pooled connection) to fetch the feed
+            response = HTTPClient().get(feed_url, headers=headers, timeout=self.__timeout)
             response.raise_for_status()  # Raise an exception for 4xx/5xx HTTP error codes
 
+            # Feed not modified since the last (cached) request, skip parsing
+            if response.status_code == 304:
+                self.__log.info(f"RSS feed from {feed_url} not modified")
+                return None
+
+            self.__etag = response.headers.get('ETag', None)
+            self.__last_modified = response.headers.get('Last-Modified', None)
+
             # Verify that the content type of the response is actually an RSS feed (XML format)
             content_type = response.headers.get('Content-Type', None)
             if content_type is None or not (content_type.lower().startswith('application/rss+xml') or content_type.lower().startswith('text/xml')):
@@ -0,0 +1,166 @@
+from typing import Dict
+from array import array
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+import threading
+from ...utils.logger import Logger
+from ..cache.scheduler import CacheRefreshScheduler
+from ..cache.manager import CacheManager
+from .time_series import TimeSeries, TimeSeriesStore
+
+# snapshot file header: magic, format version (followed by interleaved little endian float64 (timestamp, value) samples)
+SNAPSHOT_FILE_HEADER = struct.Struct("<6sB")
+SNAPSHOT_FILE_MAGIC = b"PYSHTS"
+SNAPSHOT_FILE_VERSION = 1
+SNAPSHOT_SAMPLE_SIZE = 16
+
+DEFAULT_SNAPSHOT_INTERVAL = 60 # seconds
+DEFAULT_COMPACT_THRESHOLD = 16384 # appended samples before the snapshot file is rewritten (compacted)
+MAX_SAMPLES_PER_SECOND = 4 # expected max sample rate of a series (raw rings keep at least one snapshot interval of samples)
+
+class TimeSeriesSnapshot:
+    """
+    Persistent time series history (cache_path "history" namespace), so charts survive restarts.
+
+    New raw samples are appended (small sequential writes, SD-card friendly) from the CacheRefreshScheduler
+    worker threads (never from the render thread). When enough samples have been appended, the file is rewritten
+    (atomically) with the compact series export (tier bucket averages + raw ring).
+    """
+
+    def __init__(self, base_path: str, interval: int = DEFAULT_SNAPSHOT_INTERVAL, compact_threshold: int = DEFAULT_COMPACT_THRESHOLD) -> None:
+        """
+        Initialize the time series snapshots.
+
+        :param base_path: The cache base directory.
+        :param interval: Time (in seconds) between snapshots.
+        :param compact_threshold: Number of appended samples (by series) before the snapshot file is compacted.
+        """
+        if interval <= 0:
+            raise ValueError(f"Invalid snapshot interval: {interval}")
+        self.__log = Logger()
+        self.__base_path = os.path.join(base_path, "history")
+        os.makedirs(self.__base_path, exist_ok = True)
+        self.__compact_threshold = compact_threshold
+        self.__interval = interval
+        self.__positions: Dict[str, int] = {} # series name => persisted raw_count index
+        self.__appended: Dict[str, int] = {} # series name => samples appended since the last compaction
+        self.__lock = threading.Lock()
+        self._stop_event = threading.Event()
+        CacheRefreshScheduler().register(self, interval)
+
+    @property
+    def raw_capacity(self) -> int:
+        """Number of raw samples a series should keep, so samples are not overwritten between two snapshots."""
+        return int(self.__interval * MAX_SAMPLES_PER_SECOND)
+
+    def __path(self, name: str) -> str:
+        return os.path.join(self.__base_path, f"{hashlib.sha256(name.encode('utf-8')).hexdigest()[:32]}.series")
+
+    @staticmethod
+    def __to_file_order(samples: array) -> array:
+        if sys.byteorder != "little":
+            samples = array("d", samples)
+            samples.byteswap()
+        return samples
+
+    @staticmethod
+    def __interleave(timestamps: array, values: array) -> array:
+        samples = array("d", bytes(SNAPSHOT_SAMPLE_SIZE * len(values)))
+        samples[0::2] = timestamps
+        samples[1::2] = values
+        return TimeSeriesSnapshot.__to_file_order(samples)
+
+    def restore(self, series: TimeSeries) -> int:
+        """
+        Replay the snapshot of a series (called once, when the series is created).
+
+        :param series: The (empty) series.
+        :return: Number of restored samples.
+        """
+        path = self.__path(series.name)
+        CacheManager().register(series, path) # (snapshot files are never evicted while the series is alive)
+        count = 0
+        compact = False
+        try:
+            if os.path.exists(path):
+                with open(path, "rb") as snapshot_file:
+                    data = snapshot_file.read()
+                if len(data) < SNAPSHOT_FILE_HEADER.size or SNAPSHOT_FILE_HEADER.unpack_from(data) != (SNAPSHOT_FILE_MAGIC, SNAPSHOT_FILE_VERSION):
+                    self.__log.warning(f"Discarding time series snapshot ({path}): unsupported format")
+                    compact = True
+                else:
+                    body = data[SNAPSHOT_FILE_HEADER.size:]
+                    if len(body) % SNAPSHOT_SAMPLE_SIZE != 0:
+                        # interrupted append: drop the partial sample (rewritten on next snapshot)
+                        body = body[:len(body) - len(body) % SNAPSHOT_SAMPLE_SIZE]
+                        compact = True
+                    samples = TimeSeriesSnapshot.__to_file_order(array("d", body))
+                    for index in range(0, len(samples), 2):
+                        series.add(samples[index], samples[index + 1])
+                    count = len(samples) // 2
+                    self.__log.info(f"Time series {series.name} restored ({count} samples).")
+        except Exception as e:
+            self.__log.warning(f"Error restoring time series snapshot ({path}): {e}")
+            compact = True
+        with self.__lock:
+            self.__positions[series.name] = series.raw_count
+            self.__appended[series.name] = self.__compact_threshold if compact else count
+        return count
+
+    def scheduled_refresh(self) -> None:
+        """Snapshot pass (called from the CacheRefreshScheduler worker threads)."""
+        self.save()
+
+    def save(self) -> None:
+        """Append the new samples of every series (compacting the snapshot files over threshold)."""
+        for name in TimeSeriesStore.names():
+            try:
+                self.__save_series(TimeSeriesStore.get(name))
+            except Exception as e:
+                self.__log.error(f"Error saving time series snapshot ({name}): {e}")
+
+    def __save_series(self, series: TimeSeries) -> None:
+        path = self.__path(series.name)
+        with self.__lock:
+            position = self.__positions.get(series.name, 0)
+            if series.raw_count == position:
+                return
+            wrapped = series.raw_count - position > series.raw_capacity
+            if wrapped:
+                # raw samples overwritten since the last snapshot: rewrite the file (the gap is filled with the tier averages)
+                self.__log.warning(f"Time series {series.name} raw samples overwritten since the last snapshot ({series.raw_count - position - series.raw_capacity} samples), compacting snapshot.")
+            if wrapped or self.__appended.get(series.name, 0) >= self.__compact_threshold or not os.path.exists(path):
+                timestamps, values, position = series.export()
+                self.__write_atomic(path, SNAPSHOT_FILE_HEADER.pack(SNAPSHOT_FILE_MAGIC, SNAPSHOT_FILE_VERSION) + TimeSeriesSnapshot.__interleave(timestamps, values).tobytes())
+                self.__appended[series.name] = len(values)
+                self.__log.debug(f"Time series {series.name} snapshot compacted ({len(values)} samples).")
+            else:
+                timestamps, values, position = series.raw_since(position)
+                with open(path, "ab") as snapshot_file:
+                    snapshot_file.write(TimeSeriesSnapshot.__interleave(timestamps, values).tobytes())
+                    snapshot_file.flush()
+                    os.fsync(snapshot_file.fileno())
+                self.__appended[series.name] = self.__appended.get(series.name, 0) + len(values)
+            self.__positions[series.name] = position
+            CacheManager().record_access(path)
+
+    def __write_atomic(self, path: str, data: bytes) -> None:
+        """Write a file through a temp file + fsync + rename, so a power cut never leaves a truncated file."""
+        fd, tmp_path = tempfile.mkstemp(dir = self.__base_path, prefix = ".", suffix = ".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                tmp_file.write(data)
+                tmp_file.flush()
+                os.fsync(tmp_file.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def stop(self) -> None:
+        """Stop periodic snapshots."""
+        self._stop_event.set()
@@ -0,0 +1,347 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from array import array
+import math
+import threading
+import time
+
+DEFAULT_RAW_CAPACITY = 1024
+# rollup tiers: (bucket resolution in seconds, number of buckets)
+DEFAULT_TIERS = (
+    (1, 3600), # 1 hour at 1s
+    (60, 1440), # 24 hours at 1 min
+    (900, 672) # 7 days at 15 min
+)
+
+class TimeSeriesTier:
+    """
+    Fixed resolution rollup tier (min / max / avg buckets), array backed ring of buckets.
+
+    Buckets are addressed by id (timestamp // resolution) modulo the number of buckets, so samples
+    (even late ones) update their bucket in O(1), and buckets older than the tier span are overwritten.
+    """
+
+    __slots__ = ("resolution", "capacity", "__ids", "__min", "__max", "__sum", "__count")
+
+    def __init__(self, resolution: float, capacity: int) -> None:
+        if resolution <= 0 or capacity < 1:
+            raise ValueError(f"Invalid time series tier (resolution: {resolution}, capacity: {capacity})")
+        self.resolution = resolution
+        self.capacity = capacity
+        self.__ids = array("q", [ -1 ]) * capacity
+        self.__min = array("d", bytes(8 * capacity))
+        self.__max = array("d", bytes(8 * capacity))
+        self.__sum = array("d", bytes(8 * capacity))
+        self.__count = array("L", bytes(array("L").itemsize * capacity))
+
+    @property
+    def span(self) -> float:
+        """Time range (in seconds) covered by the tier."""
+        return self.resolution * self.capacity
+
+    def add(self, timestamp: float, value: float) -> None:
+        bucket_id = int(timestamp // self.resolution)
+        slot = bucket_id % self.capacity
+        current_id = self.__ids[slot]
+        if current_id == bucket_id:
+            if value < self.__min[slot]:
+                self.__min[slot] = value
+            if value > self.__max[slot]:
+                self.__max[slot] = value
+            self.__sum[slot] += value
+            self.__count[slot] += 1
+        elif current_id < bucket_id:
+            # new bucket (replaces the expired one)
+            self.__ids[slot] = bucket_id
+            self.__min[slot] = value
+            self.__max[slot] = value
+            self.__sum[slot] = value
+            self.__count[slot] = 1
+        # (samples older than the tier span are ignored)
+
+    def averages(self, start: float, end: float) -> Tuple[array, array]:
+        """
+        Get the (bucket start timestamp, avg) of every bucket of a time range (only the buckets ending before the range end,
+        so the samples of the finer data following the range are not counted twice).
+
+        :param start: The range start timestamp (included).
+        :param end: The range end timestamp (excluded).
+        :return: The (timestamps, values) arrays, oldest first.
+        """
+        timestamps, values = array("d"), array("d")
+        first_id = int(start // self.resolution)
+        last_id = int(end // self.resolution) - 1
+        for bucket_id in range(max(first_id, last_id - self.capacity + 1), last_id + 1):
+            slot = bucket_id % self.capacity
+            bucket_start = bucket_id * self.resolution
+            if self.__ids[slot] == bucket_id and start <= bucket_start:
+                timestamps.append(bucket_start)
+                values.append(self.__sum[slot] / self.__count[slot])
+        return timestamps, values
+
+    def query(self, start: float, end: float, points: int) -> List[Optional[Tuple[float, float, float]]]:
+        """
+        Aggregate the buckets of a time range into points (columns).
+
+        :param start: The range start timestamp.
+        :param end: The range end timestamp.
+        :param points: The number of points.
+        :return: A (min, max, avg) tuple by point (None for points without samples).
+        """
+        result: List[Optional[Tuple[float, float, float]]] = [ None ] * points
+        first_id = int(start // self.resolution)
+        last_id = int(end // self.resolution)
+        point_duration = (end - start) / points
+        for bucket_id in range(max(first_id, last_id - self.capacity + 1), last_id + 1):
+            slot = bucket_id % self.capacity
+            if self.__ids[slot] != bucket_id:
+                continue
+            point = min(points - 1, max(0, int((bucket_id * self.resolution - start) / point_duration)))
+            bucket_min, bucket_max, bucket_sum, bucket_count = self.__min[slot], self.__max[slot], self.__sum[slot], self.__count[slot]
+            current = result[point]
+            if current is None:
+                result[point] = (bucket_min, bucket_max, bucket_sum, bucket_count)
+            else:
+                result[point] = (min(current[0], bucket_min), max(current[1], bucket_max), current[2] + bucket_sum, current[3] + bucket_count)
+        return [ (point[0], point[1], point[2] / point[3]) if point is not None else None for point in result ]
+
+class TimeSeries:
+    """
+    In-process time series: raw samples (ring) plus rollup tiers, memory bounded per series.
+
+    Written by data source (producer) threads, read by the render thread.
+    """
+
+    def __init__(self, name: str, raw_capacity: int = DEFAULT_RAW_CAPACITY, tiers: Tuple[Tuple[float, int], ...] = DEFAULT_TIERS) -> None:
+        """
+        Initialize the time series.
+
+        :param name: The series name.
+        :param raw_capacity: Number of raw samples kept.
+        :param tiers: The rollup tiers, as (bucket resolution in seconds, number of buckets) tuples.
+        """
+        if raw_capacity < 1:
+            raise ValueError(f"Invalid time series raw capacity: {raw_capacity}")
+        self.__name = name
+        self.__lock = threading.Lock()
+        self.__raw_capacity = raw_capacity
+        self.__raw_timestamps = array("d", bytes(8 * raw_capacity))
+        self.__raw_values = array("d", bytes(8 * raw_capacity))
+        self.__raw_count = 0
+        self.__tiers = sorted((TimeSeriesTier(resolution, capacity) for resolution, capacity in tiers), key = lambda tier: tier.resolution)
+        self.__last_timestamp: Optional[float] = None
+        self.__last_value: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @property
+    def last_timestamp(self) -> Optional[float]:
+        return self.__last_timestamp
+
+    @property
+    def last_value(self) -> Optional[float]:
+        return self.__last_value
+
+    @property
+    def raw_capacity(self) -> int:
+        return self.__raw_capacity
+
+    @property
+    def raw_count(self) -> int:
+        """Total number of samples added (monotonic, also counts the samples no longer kept in the raw ring)."""
+        return self.__raw_count
+
+    def add(self, timestamp: Optional[float], value: float) -> None:
+        """
+        Add a sample (to the raw ring and every rollup tier).
+
+        :param timestamp: The sample timestamp (now if None).
+        :param value: The sample value.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        value = float(value)
+        if math.isnan(value):
+            return
+        with self.__lock:
+            slot = self.__raw_count % self.__raw_capacity
+            self.__raw_timestamps[slot] = timestamp
+            self.__raw_values[slot] = value
+            self.__raw_count += 1
+            for tier in self.__tiers:
+                tier.add(timestamp, value)
+            if self.__last_timestamp is None or timestamp >= self.__last_timestamp:
+                self.__last_timestamp = timestamp
+                self.__last_value = value
+
+    def add_samples(self, timestamps: Sequence[float], values: Sequence[float]) -> None:
+        """
+        Add a batch of samples (one lock acquisition for the whole batch).
+
+        :param timestamps: The sample timestamps.
+        :param values: The sample values.
+        """
+        with self.__lock:
+            for timestamp, value in zip(timestamps, values):
+                value = float(value)
+                if math.isnan(value):
+                    continue
+                slot = self.__raw_count % self.__raw_capacity
+                self.__raw_timestamps[slot] = timestamp
+                self.__raw_values[slot] = value
+                self.__raw_count += 1
+                for tier in self.__tiers:
+                    tier.add(timestamp, value)
+                if self.__last_timestamp is None or timestamp >= self.__last_timestamp:
+                    self.__last_timestamp = timestamp
+                    self.__last_value = value
+
+    def raw(self, count: Optional[int] = None) -> Tuple[array, array]:
+        """
+        Get the latest raw samples (oldest first).
+
+        :param count: Max number of samples (all the kept samples if None).
+        :return: The (timestamps, values) arrays.
+        """
+        with self.__lock:
+            available = min(self.__raw_count, self.__raw_capacity)
+            count = available if count is None else min(count, available)
+            timestamps, values = array("d"), array("d")
+            for index in range(self.__raw_count - count, self.__raw_count):
+                slot = index % self.__raw_capacity
+                timestamps.append(self.__raw_timestamps[slot])
+                values.append(self.__raw_values[slot])
+            return timestamps, values
+
+    def raw_since(self, index: int) -> Tuple[array, array, int]:
+        """
+        Get the raw samples added since a raw_count index (the samples no longer kept in the raw ring are skipped).
+
+        :param index: The raw_count index.
+        :return: The (timestamps, values) arrays, and the current raw_count index.
+        """
+        with self.__lock:
+            timestamps, values = array("d"), array("d")
+            for position in range(max(index, self.__raw_count - self.__raw_capacity), self.__raw_count):
+                slot = position % self.__raw_capacity
+                timestamps.append(self.__raw_timestamps[slot])
+                values.append(self.__raw_values[slot])
+            return timestamps, values, self.__raw_count
+
+    def export(self) -> Tuple[array, array, int]:
+        """
+        Get a compact sample history: bucket averages of every tier (only older than the finer tiers / raw ring), then raw samples.
+
+        Adding the exported samples to an empty series rebuilds its history (older min / max values are approximated by averages).
+
+        :return: The (timestamps, values) arrays (oldest first), and the current raw_count index.
+        """
+        with self.__lock:
+            timestamps, values = array("d"), array("d")
+            if self.__last_timestamp is None:
+                return timestamps, values, self.__raw_count
+            raw_available = min(self.__raw_count, self.__raw_capacity)
+            first_raw = self.__raw_count - raw_available
+            raw_start = min((self.__raw_timestamps[position % self.__raw_capacity] for position in range(first_raw, self.__raw_count)), default = self.__last_timestamp)
+            # every tier (finest first) covers its span, up to the start of the finer tier (or raw ring)
+            end = raw_start
+            ranges = []
+            for tier in self.__tiers:
+                start = self.__last_timestamp - tier.span
+                if start < end:
+                    ranges.append((tier, start, end))
+                    end = start
+            # coarsest tier first (oldest samples first)
+            for tier, start, end in reversed(ranges):
+                tier_timestamps, tier_values = tier.averages(start, end)
+                timestamps.extend(tier_timestamps)
+                values.extend(tier_values)
+            for position in range(first_raw, self.__raw_count):
+                slot = position % self.__raw_capacity
+                timestamps.append(self.__raw_timestamps[slot])
+                values.append(self.__raw_values[slot])
+            return timestamps, values, self.__raw_count
+
+    def query(self, duration: float, points: int, end: Optional[float] = None) -> List[Optional[Tuple[float, float, float]]]:
+        """
+        Get the (min, max, avg) values of the last duration seconds as points (like one point by chart pixel column).
+
+        The coarsest tier with at least one bucket by point is used (finest tier if none), so the query cost is
+        proportional to the number of points, not samples.
+
+        :param duration: The time range (in seconds), like 3600 for the last hour.
+        :param points: The number of points.
+        :param end: The range end timestamp (now if None).
+        :return: A (min, max, avg) tuple by point, oldest first (None for points without samples).
+        """
+        if points < 1 or duration <= 0:
+            raise ValueError(f"Invalid time series query (duration: {duration}, points: {points})")
+        end = end if end is not None else time.time()
+        point_duration = duration / points
+        tier = self.__tiers[0]
+        for candidate in self.__tiers:
+            if candidate.resolution <= point_duration:
+                tier = candidate
+        if tier.span < duration:
+            # the selected tier does not cover the whole range: use the finest tier covering it (if any)
+            tier = next((candidate for candidate in self.__tiers if candidate.span >= duration), self.__tiers[-1])
+        with self.__lock:
+            return tier.query(end - duration, end, points)
+
+class TimeSeriesStore:
+    """
+    A class to manage the (process-wide) time series registry using static methods.
+
+    Every data source feeds its series by name, so widgets can read any series history.
+    """
+
+    __series: Dict[str, TimeSeries] = {}
+    __snapshot: Optional[Any] = None
+    __lock = threading.Lock()
+
+    @staticmethod
+    def set_snapshot(snapshot: Optional[Any]) -> None:
+        """
+        Updates the persistent snapshot (new series are restored from it).
+
+        Args:
+            snapshot (TimeSeriesSnapshot): The snapshot (None to disable).
+        """
+        with TimeSeriesStore.__lock:
+            TimeSeriesStore.__snapshot = snapshot
+
+    @staticmethod
+    def get(name: str) -> TimeSeries:
+        """
+        Retrieves a series (created on first use).
+
+        Args:
+            name (str): The series name.
+
+        Returns:
+            TimeSeries: The series.
+        """
+        with TimeSeriesStore.__lock:
+            series = TimeSeriesStore.__series.get(name, None)
+            if series is None:
+                if TimeSeriesStore.__snapshot is not None:
+                    # raw ring large enough to keep every sample between two snapshots
+                    series = TimeSeries(name = name, raw_capacity = max(DEFAULT_RAW_CAPACITY, TimeSeriesStore.__snapshot.raw_capacity))
+                else:
+                    series = TimeSeries(name = name)
+                if TimeSeriesStore.__snapshot is not None:
+                    TimeSeriesStore.__snapshot.restore(series)
+                TimeSeriesStore.__series[name] = series
+            return series
+
+    @staticmethod
+    def names() -> List[str]:
+        """
+        Retrieves the names of every series.
+
+        Returns:
+            List[str]: The series names.
+        """
+        with TimeSeriesStore.__lock:
+            return list(TimeSeriesStore.__series.keys())
@@ -4,6 +4,7 @@ import requests
 from .weather import Weather, WeatherDataType
 import json
 from ...utils.logger import Logger
+from ..http.http_client import HTTPClient
 
 class OpenMeteo (Weather):
     def __init__(self, logger: Logger, latitude: float , longitude: float,
@@ -35,7 +36,7 @@ class OpenMeteo (Weather):
             }
 
             try:
-                response = requests.get(self._api_url, params=self._api_params, headers=headers, timeout=10)
+                response = HTTPClient().get(self._api_url, params=self._api_params, headers=headers)
                 response.raise_for_status()
                 json_data = response.json()
                 print(json.dumps(json.loads(json_data)))
@@ -1,10 +1,12 @@
 import yaml
 import locale
 import os
-from typing import Optional, Any
+from typing import Optional, Any, Dict
 from .logger import Logger
 from ..display.icons.font_awesome.icon import Icon as FontAwesomeIcon
 from ..display.fps import FPS
+from ..display.animation_manager import AnimationManager
+from ..modules.cache.memory import MemoryCacheTier
 
 class Configuration:
 
@@ -43,6 +45,8 @@ class AppSettings (Configuration):
             locale.setlocale(locale.LC_TIME, self._loaded_configuration.get('app', {}).get("locale", "en_EN.UTF-8"))
             FontAwesomeIcon.set_default_font_path(self._loaded_configuration.get('resources', {}).get('font_awesome_path', None))
             FPS.set_default_fps(self._loaded_configuration.get('app', {}).get('max_fps', 30))
+            MemoryCacheTier.set_max_size(self._loaded_configuration.get('app', {}).get('cache_memory_limit_mb', 8) * 1024 * 1024)
+            AnimationManager.set_frame_budget(self._loaded_configuration.get('app', {}).get('animation_frame_budget_ms', 4))
             return True
         else:
             return False
@@ -59,6 +63,19 @@ class AppSettings (Configuration):
     def cache_path(self) -> Optional[str]:
         return self._loaded_configuration.get('app', {}).get('cache_path', None)
 
+    @property
+    def cache_quotas(self) -> Dict[str, int]:
+        quotas_mb = self._loaded_configuration.get('app', {}).get('cache_quotas_mb', {}) or {}
+        return { namespace: int(quota_mb * 1024 * 1024) for namespace, quota_mb in quotas_mb.items() }
+
+    @property
+    def cache_gc_interval(self) -> int:
+        return self._loaded_configuration.get('app', {}).get('cache_gc_interval', 600)
+
+    @property
+    def history_snapshot_interval(self) -> int:
+        return self._loaded_configuration.get('app', {}).get('history_snapshot_interval', 60)
+
     @property
     def show_fps(self) -> bool:
         return self._loaded_configuration.get('app', {}).get('show_fps', False)
@@ -84,20 +101,34 @@ class AppSettings (Configuration):
         return self._loaded_configuration.get('app', {}).get('monitor_index', 0)
 
     @property
-    def mqtt_broker_host(self) -> Optional[str]:
-        return self._loaded_configuration.get('mqtt', {}).get('broker_host', None)
+    def mqtt_connections(self) -> Dict[str, Dict[str, Any]]:
+        """Named broker connections (the flat mqtt settings of older configurations are the "default" connection)."""
+        mqtt_settings = self._loaded_configuration.get('mqtt', {}) or {}
+        if 'connections' in mqtt_settings:
+            return mqtt_settings.get('connections', {}) or {}
+        if mqtt_settings.get('broker_host', None):
+            return { "default": mqtt_settings }
+        return {}
+
+    @property
+    def http_timeout(self) -> int:
+        return self._loaded_configuration.get('http', {}).get('timeout', 10)
+
+    @property
+    def http_retries(self) -> int:
+        return self._loaded_configuration.get('http', {}).get('retries', 3)
 
     @property
-    def mqtt_broker_port(self) -> Optional[int]:
-        return self._loaded_configuration.get('mqtt', {}).get('broker_port', None)
+    def http_backoff_factor(self) -> float:
+        return self._loaded_configuration.get('http', {}).get('backoff_factor', 0.5)
 
     @property
-    def mqtt_username(self) -> Optional[str]:
-        return self._loaded_configuration.get('mqtt', {}).get('username', None)
+    def http_max_concurrency(self) -> int:
+        return self._loaded_configuration.get('http', {}).get('max_concurrency', 4)
 
     @property
-    def mqtt_password(self) -> Optional[str]:
-        return self._loaded_configuration.get('mqtt', {}).get('password', None)
+    def http_pool_maxsize(self) -> int:
+        return self._loaded_configuration.get('http', {}).get('pool_maxsize', 4)
 
     @property
     def skin(self) -> Optional[str]: